@@ -1,7 +1,9 @@
+from itertools import chain
+
 from rdflib import plugin
 from rdflib.store import Store, NO_STORE
 
-from .utils import FCN
+from .utils import _cached_fcn
 
 
 class AggregateStore(Store):
@@ -27,17 +29,38 @@ class AggregateStore(Store):
     # after the store is open, so we don't care if we need to change it to `True` later.
     supports_range_queries = False
 
-    def __init__(self, configuration=None, identifier=None, graph_aware=None):
+    def __init__(self, configuration=None, identifier=None, graph_aware=None, dedup=False):
+        '''
+        Parameters
+        ----------
+        configuration : list of tuple, optional
+            Passed on to `Store <rdflib.store.Store.__init__>`
+        identifier : rdflib.term.Identifier, optional
+            Passed on to `Store <rdflib.store.Store.__init__>`
+        graph_aware : bool, optional
+            Overrides `graph_aware`
+        dedup : bool, optional
+            If `True`, triples, contexts, and namespaces found in more than one
+            aggregated store are only returned once. For triples, the contexts from all
+            of the stores that return the triple are merged. May also be set by the
+            configuration passed to :meth:`open`
+        '''
         super(AggregateStore, self).__init__(configuration, identifier)
-        self.__stores = []
+        self.__stores = ()
         self.__bound_ns = dict()
         self.__bound_pref = dict()
+        self.__ns_cache = dict()
+        self.__prefix_cache = dict()
+        self.dedup = dedup
         if graph_aware is not None:
             self.graph_aware = graph_aware
 
     @property
     def stores(self):
-        return list(self.__stores)
+        '''
+        The aggregated stores, in order. A `tuple`, so it can't be modified
+        '''
+        return self.__stores
 
     # -- Store methods -- #
 
@@ -45,15 +68,30 @@ class AggregateStore(Store):
         '''
         Creates and opens all of the stores specified in the configuration
 
+        The configuration is either a list of ``(store_key, store_conf)`` pairs or a
+        `dict` with the list of pairs under ``'stores'`` and, optionally, a value for
+        `dedup <__init__>` under ``'dedup'``.
+
         Also checks for all aggregated stores to be `context_aware`
         '''
-        if not isinstance(configuration, (tuple, list)):
+        if isinstance(configuration, dict):
+            try:
+                store_confs = configuration['stores']
+            except KeyError:
+                raise ValueError('Missing stores entry')
+            self.dedup = configuration.get('dedup', self.dedup)
+        elif isinstance(configuration, (tuple, list)):
+            store_confs = configuration
+        else:
             return NO_STORE
-        self.__stores = []
-        for store_key, store_conf in configuration:
+        stores = []
+        for store_key, store_conf in store_confs:
             store = plugin.get(store_key, Store)()
             store.open(store_conf)
-            self.__stores.append(store)
+            stores.append(store)
+        self.__stores = tuple(stores)
+        self.__ns_cache.clear()
+        self.__prefix_cache.clear()
         assert self.__stores, 'At least one store configuration must be provided'
         assert all(x.context_aware for x in self.__stores), ('All aggregated stores must be'
                                                              ' context_aware')
@@ -61,57 +99,89 @@ class AggregateStore(Store):
         self.supports_range_queries = all(getattr(x, 'supports_range_queries', False) for x in self.__stores)
 
     def triples(self, triple, context=None):
-        for store in self.__stores:
-            for trip in store.triples(triple, context=context):
-                yield trip
+        stores = self.__stores
+        if len(stores) == 1:
+            return stores[0].triples(triple, context=context)
+        res = chain.from_iterable(store.triples(triple, context=context)
+                                  for store in stores)
+        if self.dedup:
+            res = _merge_contexts(res)
+        return res
 
     def triples_choices(self, triple, context=None):
-        for store in self.__stores:
-            for trip in store.triples_choices(triple, context=context):
-                yield trip
+        stores = self.__stores
+        if len(stores) == 1:
+            return stores[0].triples_choices(triple, context=context)
+        res = chain.from_iterable(store.triples_choices(triple, context=context)
+                                  for store in stores)
+        if self.dedup:
+            res = _merge_contexts(res)
+        return res
 
     def __len__(self, context=None):
         # rdflib specifies a context argument for __len__, but how do you even pass that
         # argument to len?
-        return sum(len(store) for store in self.__stores)
+        stores = self.__stores
+        if len(stores) == 1:
+            return len(stores[0])
+        return sum(len(store) for store in stores)
 
     def contexts(self, triple=None):
-        for store in self.__stores:
-            for ctx in store.contexts(triple):
-                yield ctx
+        stores = self.__stores
+        if len(stores) == 1:
+            return stores[0].contexts(triple)
+        res = chain.from_iterable(store.contexts(triple) for store in stores)
+        if self.dedup:
+            res = _unique(res, key=lambda ctx: getattr(ctx, 'identifier', ctx))
+        return res
 
     def prefix(self, namespace):
         prefix = self.__bound_pref.get(namespace)
         if prefix is None:
+            try:
+                return self.__prefix_cache[namespace]
+            except KeyError:
+                pass
             for store in self.__stores:
                 aprefix = store.prefix(namespace)
                 if aprefix and prefix and aprefix != prefix:
                     msg = 'multiple prefixes ({},{}) for namespace {}'.format(prefix, aprefix, namespace)
                     raise AggregatedStoresConflict(msg)
                 prefix = aprefix
+            self.__prefix_cache[namespace] = prefix
         return prefix
 
     def namespace(self, prefix):
         namespace = self.__bound_ns.get(prefix)
         if namespace is None:
+            try:
+                return self.__ns_cache[prefix]
+            except KeyError:
+                pass
             for store in self.__stores:
                 anamespace = store.namespace(prefix)
                 if anamespace and namespace and anamespace != namespace:
                     msg = 'multiple namespaces ({},{}) for prefix {}'.format(namespace, anamespace, prefix)
                     raise AggregatedStoresConflict(msg)
                 namespace = anamespace
+            self.__ns_cache[prefix] = namespace
         return namespace
 
     def namespaces(self):
-        for ns in self.__bound_ns.items():
-            yield ns
-        for store in self.__stores:
-            for ns in store.namespaces():
-                yield ns
+        stores = self.__stores
+        if len(stores) == 1 and not self.__bound_ns:
+            return stores[0].namespaces()
+        res = chain(self.__bound_ns.items(),
+                    chain.from_iterable(store.namespaces() for store in stores))
+        if self.dedup:
+            res = _unique(res)
+        return res
 
     def bind(self, prefix, namespace):
         self.__bound_ns[prefix] = namespace
         self.__bound_pref[namespace] = prefix
+        self.__ns_cache.clear()
+        self.__prefix_cache.clear()
 
     def close(self, *args, **kwargs):
         for store in self.__stores:
@@ -152,7 +222,35 @@ class AggregateStore(Store):
         return self.__stores[0].commit(*args, **kwargs)
 
     def __repr__(self):
-        return '%s(%s)' % (FCN(type(self)), ', '.join(repr(s) for s in self.__stores))
+        return '%s(%s)' % (_cached_fcn(type(self)), ', '.join(repr(s) for s in self.__stores))
+
+
+def _unique(results, key=None):
+    seen = set()
+    for r in results:
+        k = r if key is None else key(r)
+        if k in seen:
+            continue
+        seen.add(k)
+        yield r
+
+
+def _merge_contexts(results):
+    '''
+    Merges the contexts of triples returned more than once in `results`
+
+    All of the results have to be read before any can be returned, since a triple can be
+    returned again by the last store.
+    '''
+    merged = dict()
+    for t, ctxs in results:
+        tctxs = merged.get(t)
+        if tctxs is None:
+            tctxs = merged[t] = dict()
+        for c in ctxs:
+            tctxs.setdefault(getattr(c, 'identifier', c), c)
+    for t, tctxs in merged.items():
+        yield t, tuple(tctxs.values())
 
 
 class UnsupportedAggregateOperation(Exception):
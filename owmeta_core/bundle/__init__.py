@@ -27,14 +27,15 @@ from ..context_common import CONTEXT_IMPORTS
 from ..data import Data
 from ..file_match import match_files
 from ..file_lock import lock_file
-from ..file_utils import hash_file
+from ..file_utils import hash_and_copy_file
 from ..graph_serialization import write_canonical_to_file
 from ..rdf_utils import transitive_lookup, BatchAddGraph
 from ..utils import FCN, aslist
 
 from .archive import Unarchiver
 from .common import (find_bundle_directory, fmt_bundle_directory, BUNDLE_MANIFEST_FILE_NAME,
-                     BUNDLE_INDEXED_DB_NAME, validate_manifest, BUNDLE_MANIFEST_VERSION)
+                     BUNDLE_INDEXED_DB_NAME, validate_manifest, BUNDLE_MANIFEST_VERSION,
+                     directory_is_empty)
 from .exceptions import (NotADescriptor, BundleNotFound, NoRemoteAvailable, NoBundleLoader,
                          NotABundlePath, MalformedBundle, NoAcceptableUploaders,
                          FetchTargetIsNotEmpty, TargetIsNotEmpty, UncoveredImports)
@@ -981,11 +982,8 @@ class Fetcher(_RemoteHandlerMixin):
         return latest_bundle_version
 
     def _assert_target_is_empty(self, bdir):
-        target_empty = True
         try:
-            for _ in scandir(bdir):
-                target_empty = False
-                break
+            target_empty = directory_is_empty(bdir)
         except FileNotFoundError:
             return
         if not target_empty:
@@ -1128,10 +1126,9 @@ class Cache(object):
                 raise
 
             def keyfunc(x):
-                try:
+                if x.name.isdecimal():
                     return int(x.name)
-                except ValueError:
-                    return float('+inf')
+                return float('+inf')
 
             for version_directory in sorted(version_directories, key=keyfunc, reverse=True):
                 if not version_directory.is_dir():
@@ -1242,6 +1239,8 @@ class Installer(object):
         self.class_registry_ctx = class_registry_ctx
         self.remotes = list(remotes)
         self.remotes_directory = remotes_directory
+        # Dependency bundles by (id, version), shared across calls to `install`
+        self._dependency_bundles = dict()
 
     def install(self, descriptor, progress_reporter=None):
         '''
@@ -1273,11 +1272,7 @@ class Installer(object):
         except OSError:
             pass
 
-        target_empty = True
-        for _ in scandir(staging_directory):
-            target_empty = False
-            break
-        if not target_empty:
+        if not directory_is_empty(staging_directory):
             raise TargetIsNotEmpty(staging_directory)
 
         with lock_file(p(staging_directory, '.lock'), unique_key=self.installer_id):
@@ -1288,12 +1283,18 @@ class Installer(object):
             except Exception:
                 self._cleanup_failed_install(staging_directory)
                 raise
+            finally:
+                # A new version of this bundle may change which version an unversioned
+                # dependency on it resolves to
+                self._forget_dependency_bundles(descriptor.id)
 
     def _cleanup_failed_install(self, staging_directory):
         shutil.rmtree(p(staging_directory, 'graphs'))
         shutil.rmtree(p(staging_directory, 'files'))
 
     def _install(self, descriptor, staging_directory, progress_reporter=None):
+        # IDs of the contexts written to the graphs index, in the order written
+        self._written_ctxids = []
         graphs_directory, files_directory = self._set_up_directories(staging_directory)
         self._write_file_hashes(descriptor, files_directory)
         self._write_context_data(descriptor, graphs_directory)
@@ -1320,9 +1321,8 @@ class Installer(object):
             for fname in _select_files(descriptor, self.source_directory):
                 hsh = self.file_hash()
                 source_fname = p(self.source_directory, fname)
-                hash_file(hsh, source_fname)
+                hash_and_copy_file(hsh, source_fname, p(files_directory, fname))
                 self._write_hash_line(hash_out, fname.encode('UTF-8'), hsh)
-                shutil.copy2(source_fname, p(files_directory, fname))
 
     def _write_context_data(self, descriptor, graphs_directory):
         contexts = _select_contexts(descriptor, self.graph)
@@ -1396,12 +1396,7 @@ class Installer(object):
             return
         imports_ctxg = self.graph.get_context(self.imports_ctx)
         # select all of the imports for all of the contexts in the bundle and serialize
-        contexts = []
-        idx_fname = p(graphs_directory, 'index')
-        with open(idx_fname) as index_file:
-            for l in index_file:
-                ctx, _ = l.strip().split('\x00')
-                contexts.append(URIRef(ctx))
+        contexts = [URIRef(ctx) for ctx in self._written_ctxids]
         for c in descriptor.empties:
             contexts.append(URIRef(c))
         ctxgraph = imports_ctxg.triples_choices((contexts, CONTEXT_IMPORTS, None))
@@ -1444,6 +1439,7 @@ class Installer(object):
                 gbname, hsh = self._write_graph_to_file(ctxgraph, graphs_directory)
                 self._write_hash_line(hash_out, ctxidb, hsh)
                 self._write_index_line(index_out, ctxidb, gbname)
+                self._written_ctxids.append(ctxid)
                 yield ctxid
             hash_out.flush()
             index_out.flush()
@@ -1451,8 +1447,7 @@ class Installer(object):
     def _write_graph_to_file(self, ctxgraph, graphs_directory):
         hsh = self.context_hash()
         temp_fname = p(graphs_directory, 'graph.tmp')
-        write_canonical_to_file(ctxgraph, temp_fname)
-        hash_file(hsh, temp_fname)
+        write_canonical_to_file(ctxgraph, temp_fname, hsh)
         gbname = hsh.hexdigest() + '.nt'
         ctx_file_name = p(graphs_directory, gbname)
         rename(temp_fname, ctx_file_name)
@@ -1483,11 +1478,25 @@ class Installer(object):
             self.conf.close()
 
     def _dd_to_bundle(self, dependency_descriptor):
-        return Bundle(dependency_descriptor.id,
-                version=dependency_descriptor.version,
-                bundles_directory=self.bundles_directory,
-                remotes=self.remotes,
-                remotes_directory=self.remotes_directory)
+        version = dependency_descriptor.version
+        key = (dependency_descriptor.id, version)
+        bnd = self._dependency_bundles.get(key)
+        if bnd is None:
+            bnd = Bundle(dependency_descriptor.id,
+                    version=version,
+                    bundles_directory=self.bundles_directory,
+                    remotes=self.remotes,
+                    remotes_directory=self.remotes_directory)
+            # Without a version, the dependency is whatever the latest version is when
+            # it's resolved, which another installer may change, so only pinned versions
+            # are kept
+            if version is not None:
+                self._dependency_bundles[key] = bnd
+        return bnd
+
+    def _forget_dependency_bundles(self, bundle_id):
+        for key in [k for k in self._dependency_bundles if k[0] == bundle_id]:
+            del self._dependency_bundles[key]
 
     def _cover_with_dependencies(self, uncovered_contexts, descriptor):
         # XXX: Will also need to check for the contexts having a given ID being consistent
@@ -1631,12 +1640,24 @@ def _select_files(descriptor, directory):
 
 
 def _select_contexts(descriptor, graph):
+    # Plain URI includes are checked with one set look-up rather than a call per include
+    include_uris = set()
+    other_includes = []
+    for inc in descriptor.includes:
+        if type(inc) is URIIncludeFunc:
+            include_uris.add(str(inc.include))
+        else:
+            other_includes.append(inc)
+
     for context in graph.contexts():
         ctx = context.identifier
-        for inc in descriptor.includes:
-            if inc(ctx):
-                yield ctx, context
-                break
+        if ctx.strip() in include_uris:
+            yield ctx, context
+        else:
+            for inc in other_includes:
+                if inc(ctx):
+                    yield ctx, context
+                    break
 
         for pat in descriptor.patterns:
             if pat(ctx):
@@ -1,6 +1,6 @@
 from contextlib import contextmanager
 import logging
-from os import scandir, walk
+from os import walk
 from os.path import join as p, relpath, realpath, abspath, isdir, dirname
 import json
 import shutil
@@ -8,7 +8,7 @@ import tarfile
 import tempfile
 
 from .common import (fmt_bundle_directory, validate_manifest, find_bundle_directory,
-                     bundle_tree_filter)
+                     bundle_tree_filter, directory_is_empty)
 from .exceptions import NotABundlePath
 
 
@@ -102,13 +102,10 @@ class Unarchiver(object):
                 target_directory = expected_target_directory
 
             L.debug('extracting %s to %s', input_file, target_directory)
-            target_directory_empty = True
             try:
-                for _ in scandir(target_directory):
-                    target_directory_empty = False
-                    break
+                target_directory_empty = directory_is_empty(target_directory)
             except FileNotFoundError:
-                pass
+                target_directory_empty = True
             if not target_directory_empty:
                 raise UnarchiveFailed('Target directory, "%s", is not empty' %
                         target_directory)
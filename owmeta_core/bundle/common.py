@@ -111,15 +111,14 @@ def find_bundle_directory(bundles_directory, ident, version=None):
                 raise BundleNotFound(ident, 'Bundle directory does not exist') from e
             raise
 
-        for ent in ents:
-            if ent.is_dir():
-                try:
+        with ents:
+            for ent in ents:
+                # We may put things other than versioned bundle directories in this
+                # directory later, so names that aren't version numbers are skipped.
+                # DirEntry.is_dir usually answers from the directory listing, without a
+                # stat call per entry
+                if ent.name.isdecimal() and ent.is_dir():
                     vn = int(ent.name)
-                except ValueError:
-                    # We may put things other than versioned bundle directories in
-                    # this directory later, in which case this is OK
-                    pass
-                else:
                     if vn > latest_version:
                         latest_version = vn
         version = latest_version
@@ -136,6 +135,25 @@ def find_bundle_directory(bundles_directory, ident, version=None):
     return res
 
 
+def directory_is_empty(path):
+    '''
+    Returns whether a directory has no entries. Stops at the first entry rather than
+    listing the whole directory.
+
+    Parameters
+    ----------
+    path : str
+        The directory to check
+
+    Raises
+    ------
+    FileNotFoundError
+        Thrown when the directory doesn't exist
+    '''
+    with scandir(path) as entries:
+        return next(entries, None) is None
+
+
 def bundle_tree_filter(path, fullpath):
     '''
     Returns true for file names that are to be included in a bundle for deployment or
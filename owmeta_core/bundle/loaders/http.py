@@ -5,6 +5,7 @@ import os
 from os.path import join as p, expanduser
 import ssl
 from urllib.parse import quote as urlquote, urlparse
+from functools import lru_cache
 import hashlib
 import json
 import pickle
@@ -26,6 +27,18 @@ from . import LoadFailed, Loader, Uploader
 L = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=32)
+def _retrieve_cached_provider(provider_path):
+    '''
+    `~owmeta_core.utils.retrieve_provider` for session and SSL context providers, cached
+    by `provider_path` since the same provider is looked up for each session or context.
+
+    Later changes to the attributes along the path are not reflected until
+    ``_retrieve_cached_provider.cache_clear()`` is called. Failed lookups are not cached.
+    '''
+    return retrieve_provider(provider_path)
+
+
 class HTTPURLConfig(URLConfig):
     '''
     HTTP URL configuration
@@ -105,7 +118,7 @@ class HTTPURLConfig(URLConfig):
             return session
 
     def _provide_session(self):
-        return retrieve_provider(self.session_provider)()
+        return _retrieve_cached_provider(self.session_provider)()
 
     def save_session(self):
         sfname = expanduser(self.session_file_name)
@@ -169,7 +182,7 @@ class HTTPSURLConfig(HTTPURLConfig):
 
     def _lookup_ssl_context_provider(self):
         try:
-            return retrieve_provider(self.ssl_context_provider)
+            return _retrieve_cached_provider(self.ssl_context_provider)
         except ValueError:
             raise HTTPSURLError('Format of the provider path is incorrect')
         except AttributeError:
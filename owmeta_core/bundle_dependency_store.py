@@ -253,6 +253,8 @@ def _is_cacheable(store_key, store_conf):
         True If the given store configuration is cacheable
     '''
     if store_key == 'agg':
+        if isinstance(store_conf, dict):
+            store_conf = store_conf.get('stores', ())
         return all(_is_cacheable(k, c) for k, c in store_conf)
     if store_key == 'FileStorageZODB':
         if isinstance(store_conf, dict) and store_conf.get('read_only', False):
@@ -7,7 +7,7 @@ import functools
 
 from .utils import FCN
 from .docscrape import parse as npdoc_parse
-from .command_util import IVar, SubCommand
+from .command_util import PlainIVar, SubCommand
 
 
 # TODO: Use `inspect` module for getting argument names so we aren't depending on
@@ -404,7 +404,7 @@ class CLICommandWrapper(object):
 
                 subparser = sp().add_parser(key, help=summary, description=detail)
                 type(self)(sub_runner, sub_mapper, hints_map=self.hints_map).parser(subparser)
-            elif isinstance(val, IVar):
+            elif isinstance(val, PlainIVar):
                 doc = getattr(val, '__doc__', None)
                 var_hints = self.hints.get(key) if self.hints else None
                 if val.default_value:
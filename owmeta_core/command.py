@@ -36,8 +36,8 @@ from pkg_resources import iter_entry_points, DistributionNotFound
 import rdflib
 from rdflib.term import URIRef
 
-from .command_util import (IVar, SubCommand, GeneratorWithData, GenericUserError,
-                           DEFAULT_OWM_DIR)
+from .command_util import (IVar, PlainIVar, SubCommand, GeneratorWithData,
+                           GenericUserError, DEFAULT_OWM_DIR)
 from . import connect, OWMETA_PROFILE_DIR
 from .bundle import (BundleDependentStoreConfigBuilder, BundleDependencyManager,
                      retrieve_remotes)
@@ -471,7 +471,7 @@ class OWMConfig(object):
     '''
     Config file commands
     '''
-    user = IVar(value_type=bool,
+    user = PlainIVar(value_type=bool,
                 default_value=False,
                 doc='If set, configs are only for the user; otherwise, they \
                        would be committed to the repository')
@@ -961,17 +961,17 @@ class OWM(object):
     High-level commands for working with owmeta data
     """
 
-    graph_accessor_finder = IVar(doc='Finds an RDFLib graph from the given URL')
+    graph_accessor_finder = PlainIVar(doc='Finds an RDFLib graph from the given URL')
 
-    basedir = IVar('.', doc='The base directory. owmdir is resolved against this base')
+    basedir = PlainIVar('.', doc='The base directory. owmdir is resolved against this base')
 
-    repository_provider = IVar(doc='The provider of the repository logic'
+    repository_provider = PlainIVar(doc='The provider of the repository logic'
                                    ' (cloning, initializing, committing, checkouts)')
 
-    non_interactive = IVar(value_type=bool,
+    non_interactive = PlainIVar(value_type=bool,
             doc='If this option is provided, then interactive prompts are not allowed')
 
-    context = IVar(doc='Context to use instead of the default context. Commands that'
+    context = PlainIVar(doc='Context to use instead of the default context. Commands that'
             ' work with other contexts (e.g., `owm contexts rm-import`) will continue'
             ' to use those other contexts unless otherwise indicated')
 
@@ -6,17 +6,25 @@ from .utils import FCN
 DEFAULT_OWM_DIR = '.owm'
 
 
-class IVar(object):
+class PlainIVar(object):
     '''
     A descriptor for instance variables amended to provide some attributes like
     default values, value types, etc.
+
+    This is a non-data descriptor: reads return the default value until the attribute is
+    assigned on the instance. The assigned value is stored in the instance ``__dict__``
+    and shadows the descriptor, so later reads are plain attribute lookups.
+
+    This is the base class of `IVar`, so code looking for the instance variables of a
+    command, like `~.cli_command_wrapper.CLICommandWrapper`, should check for
+    `PlainIVar`.
     '''
 
     _instance_counter = 0
 
     def __init__(self, default_value=None, doc=None, value_type=str, name=None):
-        self.name = ('_ivar_' + str(IVar._instance_counter)) if name is None else name
-        IVar._instance_counter += 1
+        self.name = ('_ivar_' + str(PlainIVar._instance_counter)) if name is None else name
+        PlainIVar._instance_counter += 1
         self.default_value = default_value
         self.__doc__ = doc.strip() if doc is not None else doc
         self.value_type = value_type
@@ -27,6 +35,20 @@ class IVar(object):
 
     __str__ = __repr__
 
+    def __get__(self, target, typ=None):
+        if target is None:
+            return self
+        return self.default_value
+
+
+class IVar(PlainIVar):
+    '''
+    A `PlainIVar` that is also a data descriptor
+
+    Assigned values are stored under `name` on the instance and every read goes through
+    `__get__`, which lets sub-classes like `PropertyIVar` compute the value.
+    '''
+
     def __get__(self, target, typ=None):
         if target is None:
             return self
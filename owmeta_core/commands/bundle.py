@@ -12,7 +12,7 @@ from urllib.parse import urlparse
 import yaml
 
 from ..context import DEFAULT_CONTEXT_KEY, IMPORTS_CONTEXT_KEY, CLASS_REGISTRY_CONTEXT_KEY
-from ..command_util import GenericUserError, GeneratorWithData, SubCommand, IVar
+from ..command_util import GenericUserError, GeneratorWithData, SubCommand, PlainIVar
 from ..bundle import (Descriptor,
                       Installer,
                       URLConfig,
@@ -169,7 +169,7 @@ class OWMBundleRemoteUpdate(_OWMBundleRemoteAddUpdate):
 class OWMBundleRemote(object):
     ''' Commands for dealing with bundle remotes '''
 
-    user = IVar(value_type=bool,
+    user = PlainIVar(value_type=bool,
             doc='If this option is provided, then remotes in the user profile directory'
                 ' are used rather than those in the project directory.')
 
@@ -109,6 +109,7 @@ class Context(six.with_metaclass(ContextMeta,
 
     .. automethod:: __call__
     .. automethod:: __bool__
+    .. automethod:: __contains__
     """
 
     def __init__(self, ident=None,
@@ -181,12 +182,15 @@ class Context(six.with_metaclass(ContextMeta,
         '''
         Clear declared statements
         '''
+        self._graph = None
         del self._statements[:]
+        self._change_counter += 1
 
     def add_import(self, context):
         '''
         Add an imported context
         '''
+        self._graph = None
         self._imported_contexts.append(context)
 
     def add_statement(self, stmt):
@@ -207,12 +211,40 @@ class Context(six.with_metaclass(ContextMeta,
         stmt : tuple
             Statement to add
         '''
-        if self.identifier != stmt.context.identifier:
+        ident = stmt.context.identifier
+        # Statements usually share the context's identifier object, so the identity check
+        # skips URIRef.__eq__ in the common case
+        if ident is not self.identifier and ident != self.identifier:
             raise ValueError("Cannot add statements from a different context")
         self._graph = None
         self._statements.append(stmt)
         self._change_counter += 1
 
+    def add_statements(self, stmts):
+        '''
+        Add several statements to the context at once. If any of the statements is from a
+        different context, then none of them are added.
+
+        Parameters
+        ----------
+        stmts : iterable of tuple
+            Statements to add
+
+        See Also
+        --------
+        add_statement
+        '''
+        stmts = list(stmts)
+        ident = self.identifier
+        if any(stmt.context.identifier is not ident and stmt.context.identifier != ident
+               for stmt in stmts):
+            raise ValueError("Cannot add statements from a different context")
+        if not stmts:
+            return
+        self._graph = None
+        self._statements.extend(stmts)
+        self._change_counter += 1
+
     def remove_statement(self, stmt):
         '''
         Remove a statement from the context
@@ -449,6 +481,16 @@ class Context(six.with_metaclass(ContextMeta,
     def __len__(self):
         return len(self._statements)
 
+    def __contains__(self, triple):
+        '''
+        Returns `True` if `triple` is among the staged triples of this context. Imported
+        contexts are not checked.
+
+        Triples are computed from the statements on each check since the identifiers of
+        statement subjects and objects may change after the statement is added.
+        '''
+        return triple in self.contents_triples()
+
     def __call__(self, o=None, *args, **kwargs):
         """
         Contextualize an object
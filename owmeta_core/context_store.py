@@ -7,7 +7,7 @@ except ImportError:
     # rdflib<6.0.0
     from rdflib.plugins.memory import IOMemory as Memory
 
-from rdflib.term import Variable
+from rdflib.term import URIRef, Variable
 
 from .context_common import CONTEXT_IMPORTS
 from .rdf_utils import transitive_lookup
@@ -27,7 +27,8 @@ class ContextStore(Store):
 
     context_aware = True
 
-    def __init__(self, context=None, include_stored=False, imports_graph=None, **kwargs):
+    def __init__(self, context=None, include_stored=False, imports_graph=None,
+            indexed=True, **kwargs):
         """
         Parameters
         ----------
@@ -38,6 +39,9 @@ class ContextStore(Store):
             `context`
         imports_graph : ~rdflib.store.Store or ~rdflib.graph.Graph
             The graph to query for imports relationships between contexts
+        indexed : bool
+            If `True`, the staged triples are held in an `IndexedMemoryStore`. Otherwise,
+            RDFLib's ``Memory`` store is used. optional
         **kwargs
             Passed on to `Store <rdflib.store.Store.__init__>`
         """
@@ -45,6 +49,7 @@ class ContextStore(Store):
         self._memory_store = None
         self._include_stored = include_stored
         self._imports_graph = imports_graph
+        self._indexed = indexed
         if context is not None:
             self._init_store(context)
 
@@ -63,24 +68,27 @@ class ContextStore(Store):
             self._store_store = None
 
         if self._memory_store is None:
-            self._memory_store = Memory()
+            self._memory_store = IndexedMemoryStore() if self._indexed else Memory()
             self._init_store0(ctx)
 
-    def _init_store0(self, ctx, seen=None):
-        if seen is None:
-            seen = set()
-        ctxid = ctx.identifier
-        if ctxid in seen:
-            return
-        seen.add(ctxid)
-        self._memory_store.addN((s, p, o, ctxid)
-                                for s, p, o
-                                in ctx.contents_triples()
-                                if not (isinstance(s, Variable) or
-                                        isinstance(p, Variable) or
-                                        isinstance(o, Variable)))
-        for cctx in ctx.imports:
-            self._init_store0(cctx, seen)
+    def _init_store0(self, ctx):
+        seen = set()
+        stack = [ctx]
+        memory_store = self._memory_store
+        while stack:
+            ctx = stack.pop()
+            ctxid = ctx.identifier
+            if ctxid in seen:
+                continue
+            seen.add(ctxid)
+            # Checking the exact types rather than `isinstance` since this runs for every
+            # staged triple. This does NOT filter out instances of sub-classes of rdflib's
+            # Variable; owmeta_core doesn't define any
+            memory_store.addN([(s, p, o, ctxid)
+                               for s, p, o
+                               in ctx.contents_triples()
+                               if Variable not in (type(s), type(p), type(o))])
+            stack.extend(ctx.imports)
 
     def close(self, commit_pending_transaction=False):
         self.ctx = None
@@ -150,6 +158,101 @@ class ContextStore(Store):
             yield ctx
 
 
+class IndexedMemoryStore(Store):
+    '''
+    An in-memory store with subject-predicate-object, predicate-object-subject, and
+    object-subject-predicate indexes.
+
+    Triple patterns are answered from the index that matches the bound terms of the
+    pattern. Contexts must be given as identifiers rather than graphs. Intended to be
+    filled once and then only queried: `remove` is not supported.
+    '''
+
+    context_aware = True
+
+    def __init__(self, *args, **kwargs):
+        super(IndexedMemoryStore, self).__init__(*args, **kwargs)
+        self._spo = dict()
+        self._pos = dict()
+        self._osp = dict()
+        self._triple_contexts = dict()
+        self._context_triples = dict()
+
+    def add(self, triple, context, quoted=False):
+        ctxs = self._triple_contexts.get(triple)
+        if ctxs is None:
+            ctxs = set()
+            self._triple_contexts[triple] = ctxs
+            s, p, o = triple
+            self._spo.setdefault(s, dict()).setdefault(p, set()).add(o)
+            self._pos.setdefault(p, dict()).setdefault(o, set()).add(s)
+            self._osp.setdefault(o, dict()).setdefault(s, set()).add(p)
+        ctxs.add(context)
+        self._context_triples.setdefault(context, set()).add(triple)
+
+    def addN(self, quads):
+        for s, p, o, c in quads:
+            self.add((s, p, o), c)
+
+    def remove(self, triple, context=None):
+        raise NotImplementedError("This store does not support removal")
+
+    def _matching_triples(self, triple_pattern, context):
+        s, p, o = triple_pattern
+        if s is not None:
+            po = self._spo.get(s)
+            if not po:
+                return ()
+            if p is not None:
+                objects = po.get(p, ())
+                if o is not None:
+                    return ((s, p, o),) if o in objects else ()
+                return ((s, p, x) for x in objects)
+            elif o is not None:
+                preds = self._osp.get(o, {}).get(s, ())
+                return ((s, x, o) for x in preds)
+            return ((s, x, y) for x, objects in po.items() for y in objects)
+        elif p is not None:
+            os_ = self._pos.get(p)
+            if not os_:
+                return ()
+            if o is not None:
+                return ((x, p, o) for x in os_.get(o, ()))
+            return ((y, p, x) for x, subjects in os_.items() for y in subjects)
+        elif o is not None:
+            sp = self._osp.get(o)
+            if not sp:
+                return ()
+            return ((x, y, o) for x, preds in sp.items() for y in preds)
+        elif context is not None:
+            return self._context_triples.get(context, ())
+        else:
+            return self._triple_contexts.keys()
+
+    def triples(self, triple_pattern, context=None):
+        triple_contexts = self._triple_contexts
+        for t in self._matching_triples(triple_pattern, context):
+            ctxs = triple_contexts[t]
+            if context is None or context in ctxs:
+                yield t, iter(ctxs)
+
+    def __len__(self, context=None):
+        if context is None:
+            return len(self._triple_contexts)
+        return len(self._context_triples.get(context, ()))
+
+    def contexts(self, triple=None):
+        if triple is None:
+            yield from self._context_triples.keys()
+            return
+        seen = set()
+        for _, ctxs in self.triples(triple):
+            for c in ctxs:
+                if c not in seen:
+                    seen.add(c)
+                    yield c
+
+
 class RDFContextStore(Store):
     # Returns triples imported by the given context
     context_aware = True
@@ -162,13 +265,13 @@ class RDFContextStore(Store):
         self.__context = context
         self.__context_transitive_imports = None
         self.__include_imports = include_imports
-        self.__query_perctx = False
+        self.__query_perctx = None
 
     def __init_contexts(self):
         if self.__store is not None and self.__context_transitive_imports is None:
             if not self.__context or self.__context.identifier is None:
-                self.__context_transitive_imports = {getattr(x, 'identifier', x)
-                                                     for x in self.__store.contexts()}
+                self.__context_transitive_imports = frozenset(_cid(x)
+                                                              for x in self.__store.contexts())
             elif self.__include_imports:
                 imports = transitive_lookup(self.__store,
                                             self.__context.identifier,
@@ -180,13 +283,28 @@ class RDFContextStore(Store):
                 # the backing graph -- at this point, it's more-or-less assumed in this
                 # case though if self.__include_imports is True, we could have an empty
                 # set of imports => we query against everything
-                self.__context_transitive_imports = set([self.__context.identifier])
-
-            total_triples = self.__store.__len__()
-            per_ctx_triples = sum(self.__store.__len__(context=ctx)
-                        for ctx in self.__context_transitive_imports)
+                self.__context_transitive_imports = frozenset((self.__context.identifier,))
+
+    def __should_query_perctx(self):
+        '''
+        Returns `True` if the sum of lengths of the selected contexts is less than total
+        number of triples in the store.
+
+        Only needed for unrestricted queries, so this is computed on first use rather
+        than in `__init_contexts`
+        '''
+        if self.__query_perctx is None:
+            if len(self.__context_transitive_imports) < 2:
+                # With one context, we always query that context directly, so there's no
+                # need to count
+                self.__query_perctx = False
+            else:
+                total_triples = self.__store.__len__()
+                per_ctx_triples = sum(self.__store.__len__(context=ctx)
+                            for ctx in self.__context_transitive_imports)
 
-            self.__query_perctx = total_triples > per_ctx_triples
+                self.__query_perctx = total_triples > per_ctx_triples
+        return self.__query_perctx
 
     def triples(self, pattern, context=None):
         self.__init_contexts()
@@ -195,24 +313,16 @@ class RDFContextStore(Store):
         if ctx is _BAD_CONTEXT:
             return
 
+        imports = self.__context_transitive_imports
+        store = self.__store
         # If the sum of lengths of the selected contexts is less than total number of
         # triples, query each context in series
-        if pattern == (None, None, None) and ctx is None and self.__query_perctx:
-            imports = self.__context_transitive_imports
-            store = self.__store
+        if pattern == (None, None, None) and ctx is None and self.__should_query_perctx():
             for ctx0 in imports:
                 for t, tctxs in store.triples(pattern, ctx0):
-                    contexts = set(getattr(c, 'identifier', c) for c in tctxs)
-                    yield t, imports & contexts
+                    yield t, frozenset(cid for cid in map(_cid, tctxs) if cid in imports)
         else:
-            for t in self.__store.triples(pattern, ctx):
-                contexts = set(getattr(c, 'identifier', c) for c in t[1])
-                if self.__context_transitive_imports:
-                    inter = self.__context_transitive_imports & contexts
-                else:
-                    inter = contexts
-                if inter:
-                    yield t[0], inter
+            yield from self.__restrict_contexts(store.triples(pattern, ctx))
 
     def remove(self, pattern, context=None):
         self.__init_contexts()
@@ -220,15 +330,13 @@ class RDFContextStore(Store):
         ctx = self._determine_context(context)
         if ctx is _BAD_CONTEXT:
             return
-        for t in self.__store.triples(pattern, ctx):
-            triple = t[0]
-            contexts = set(getattr(c, 'identifier', c) for c in t[1])
-            if self.__context_transitive_imports:
-                inter = self.__context_transitive_imports & contexts
-            else:
-                inter = contexts
-            for ctx in inter:
-                self.__store.remove((triple[0], triple[1], triple[2]), ctx)
+        # Materialized since removing while iterating can change the store's indexes
+        results = self.__restrict_contexts(self.__store.triples(pattern, ctx))
+        for triple, inter in list(results):
+            for ctxid in inter:
+                # Store.remove takes the context as a graph; some stores, like rdflib's
+                # IOMemory, ignore a bare identifier
+                self.__store.remove(triple, self.__graph.get_context(ctxid))
 
     def triples_choices(self, pattern, context=None):
         self.__init_contexts()
@@ -237,15 +345,16 @@ class RDFContextStore(Store):
         if ctx is _BAD_CONTEXT:
             return
 
-        for t in self.__store.triples_choices(pattern, ctx):
-            contexts = set(getattr(c, 'identifier', c) for c in t[1])
-            if self.__context_transitive_imports:
-                inter = self.__context_transitive_imports & contexts
-            else:
-                inter = contexts
+        yield from self.__restrict_contexts(self.__store.triples_choices(pattern, ctx))
 
-            if inter:
-                yield t[0], inter
+    def __restrict_contexts(self, results):
+        imports = self.__context_transitive_imports
+        if len(imports) == 1:
+            # `_determine_context` has already scoped the query to the only import, so
+            # the intersection would always be that one context
+            only = frozenset(imports)
+            return ((t, only) for t, _ in results)
+        return _restrict_contexts(results, imports)
 
     def _determine_context(self, context):
         context = getattr(context, 'identifier', context)
@@ -262,7 +371,7 @@ class RDFContextStore(Store):
         if triple is not None:
             for x in self.triples(triple):
                 for c in x[1]:
-                    yield getattr(c, 'identifier', c)
+                    yield _cid(c)
         else:
             self.__init_contexts()
             for c in self.__context_transitive_imports:
@@ -282,4 +391,34 @@ class RDFContextStore(Store):
             yield x
 
 
+def _cid(c):
+    '''
+    Returns the identifier for a context returned from a store, which may be either the
+    identifier itself or a graph
+    '''
+    # Contexts are usually URIRefs, and checking the type is cheaper than ``getattr`` with
+    # a default
+    if type(c) is URIRef:
+        return c
+    return getattr(c, 'identifier', c)
+
+
+def _restrict_contexts(results, imports):
+    '''
+    Restricts the contexts for each triple in `results` to those in `imports`, or to all
+    of them if `imports` is empty. Triples that are left with no contexts are dropped.
+    '''
+    if imports:
+        for t, tctxs in results:
+            # Building the set and intersecting in one pass
+            inter = frozenset(cid for cid in map(_cid, tctxs) if cid in imports)
+            if inter:
+                yield t, inter
+    else:
+        for t, tctxs in results:
+            contexts = frozenset(map(_cid, tctxs))
+            if contexts:
+                yield t, contexts
+
+
 _BAD_CONTEXT = object()
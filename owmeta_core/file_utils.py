@@ -1,3 +1,6 @@
+import shutil
+
+
 def hash_file(hsh, fname, blocksize=None):
     '''
     Updates the given hash object with the contents of a file.
@@ -23,3 +26,35 @@ def hash_file(hsh, fname, blocksize=None):
             if not block:
                 break
             hsh.update(block)
+
+
+def hash_and_copy_file(hsh, source_fname, dest_fname, blocksize=None):
+    '''
+    Copies a file and updates the given hash object with its contents in a single pass
+    over the source file.
+
+    File metadata is copied as with `shutil.copy2`.
+
+    Parameters
+    ----------
+    hsh : `hashlib.hash <hashlib>`
+        The hash object to update
+    source_fname : str
+        The filename for the file to hash and copy
+    dest_fname : str
+        The filename to copy to
+    blocksize : int, optional
+        The number of bytes to read at a time. If not provided, will use
+        `shutil.COPY_BUFSIZE` or 64 KiB, whichever is larger
+    '''
+    if not blocksize:
+        blocksize = max(getattr(shutil, 'COPY_BUFSIZE', 0), 64 * 1024)
+
+    with open(source_fname, 'rb') as fh, open(dest_fname, 'wb') as out:
+        while True:
+            block = fh.read(blocksize)
+            if not block:
+                break
+            hsh.update(block)
+            out.write(block)
+    shutil.copystat(source_fname, dest_fname)
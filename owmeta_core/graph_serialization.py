@@ -2,16 +2,19 @@
 Utilies for graph serialization
 '''
 import hashlib
+import io
 from os.path import join as p, exists
+import re
 
 from rdflib import plugin
 from rdflib.parser import Parser, create_input_source
 from rdflib.serializer import Serializer
+from rdflib.term import URIRef
 
 from .rdf_utils import BatchAddGraph
 
 
-def write_canonical_to_file(graph, file_name):
+def write_canonical_to_file(graph, file_name, hsh=None):
     '''
     Write a graph to a file such that the contents would only differ if the
     set of triples in the graph were different. The serialization format is
@@ -23,14 +26,103 @@ def write_canonical_to_file(graph, file_name):
         The graph to write
     file_name : str
         The name of the file to write to
+    hsh : `hashlib.hash <hashlib>`, optional
+        If provided, the hash object is updated with the written bytes as they are
+        written, so the file doesn't have to be read back to hash it
     '''
     with open(file_name, 'wb') as f:
+        if hsh is not None:
+            f = _HashingWriter(f, hsh)
         write_canonical(graph, f)
 
 
 def write_canonical(graph, out):
-    serializer = plugin.get('nt', Serializer)(sorted(graph))
-    serializer.serialize(out)
+    '''
+    Write a graph to a binary file-like object as sorted N-Triples. See
+    `write_canonical_to_file`
+
+    Parameters
+    ----------
+    graph : rdflib.graph.Graph
+        The graph to write
+    out : :term:`file object`
+        Binary file-like object to write to
+    '''
+    # Lines are written in batches so that writers with per-call overhead, like the
+    # hashing writer, see a few large writes rather than one per triple
+    batch = []
+    # Consecutive triples without a fast-path line, formatted together by rdflib's
+    # N-Triples serializer
+    pending = []
+    for triple in sorted(graph):
+        line = _plain_nt_line(triple)
+        if line is None:
+            pending.append(triple)
+            if len(pending) < _WRITE_BATCH_SIZE:
+                continue
+        if pending:
+            batch.append(_serialize_nt(pending))
+            pending = []
+        if line is not None:
+            batch.append(line)
+        if len(batch) >= _WRITE_BATCH_SIZE:
+            out.write(b''.join(batch))
+            batch = []
+    if pending:
+        batch.append(_serialize_nt(pending))
+    batch.append(b'\n')
+    out.write(b''.join(batch))
+
+
+_WRITE_BATCH_SIZE = 1024
+
+
+# Characters which rdflib refuses to write in a URI reference
+_INVALID_URI_CHARS = re.compile('[<>" {}|\\\\^`]')
+
+
+def _plain_nt_line(triple):
+    '''
+    Format a triple of ASCII URI references, by far the most common kind, as an
+    N-Triples line in the same way as the rdflib N-Triples serializer. Returns `None` for
+    any other triple.
+    '''
+    s, p, o = triple
+    if (type(s) is URIRef and type(p) is URIRef and type(o) is URIRef and
+            not (_INVALID_URI_CHARS.search(s) or
+                 _INVALID_URI_CHARS.search(p) or
+                 _INVALID_URI_CHARS.search(o))):
+        try:
+            return ('<%s> <%s> <%s> .\n' % (s, p, o)).encode('ascii')
+        except UnicodeEncodeError:
+            pass
+    return None
+
+
+def _serialize_nt(triples):
+    '''
+    Format triples as N-Triples lines with rdflib's N-Triples serializer
+    '''
+    buf = io.BytesIO()
+    plugin.get('nt', Serializer)(triples).serialize(buf)
+    # The serializer ends its output with an extra newline; `write_canonical` adds that
+    # once at the end
+    return buf.getvalue()[:-1]
+
+
+class _HashingWriter(object):
+    '''
+    Wraps a binary file, updating a hash with everything written through it
+    '''
+    __slots__ = ('_out', '_hsh')
+
+    def __init__(self, out, hsh):
+        self._out = out
+        self._hsh = hsh
+
+    def write(self, data):
+        self._hsh.update(data)
+        return self._out.write(data)
 
 
 def read_canonical_from_file(ctx, dest, graph_fname):
@@ -8,7 +8,7 @@ import rdflib as R
 from .dataobject import (BaseDataObject, DataObject, RegistryEntry,
                          PythonClassDescription, PythonModule, ClassDescription,
                          ClassResolutionFailed, ModuleResolutionFailed)
-from .utils import FCN
+from .utils import _cached_fcn
 from .configure import Configurable
 
 
@@ -37,6 +37,13 @@ class Mapper(Configurable):
     '''
     Keeps track of relationships between classes, between modules, and between classes and modules
     '''
+
+    _generation = 0
+    '''
+    Incremented whenever classes are added to any `Mapper` or the `imported_mappers` of
+    any `Mapper` change. Used for invalidating cached class look-ups
+    '''
+
     def __init__(self, base_namespace=None, imported=(), name=None,
             class_registry_context=None, **kwargs):
         super(Mapper, self).__init__(**kwargs)
@@ -58,6 +65,9 @@ class Mapper(Configurable):
         """ Modules that have already been loaded """
         self.modules = dict()
 
+        self._lookup_cache = dict()
+        self._lookup_cache_generation = None
+
         self.imported_mappers = imported
 
         if name is None:
@@ -67,6 +77,18 @@ class Mapper(Configurable):
         self.__class_registry_context = None
         self._bootstrap_mappings()
 
+    @property
+    def imported_mappers(self):
+        '''
+        Mappers whose classes are also available through this mapper
+        '''
+        return self._imported_mappers
+
+    @imported_mappers.setter
+    def imported_mappers(self, imported):
+        self._imported_mappers = imported
+        Mapper._generation += 1
+
     @property
     def class_registry_context(self):
         if self.__class_registry_context is None:
@@ -106,7 +128,7 @@ class Mapper(Configurable):
             Thrown when `add_class` is called on a class when a class with the same name
             has already been added to the mapper
         '''
-        cname = FCN(cls)
+        cname = _cached_fcn(cls)
         maybe_cls = self._lookup_class(cname)
         if maybe_cls is not None:
             if maybe_cls is cls:
@@ -116,10 +138,13 @@ class Mapper(Configurable):
         L.debug("Adding class %s@0x%x", cls, id(cls))
 
         self._mapped_classes[cname] = cls
-        L.debug('parents %s', parents_str(cls))
+        Mapper._generation += 1
+        if L.isEnabledFor(logging.DEBUG):
+            L.debug('parents %s', parents_str(cls))
 
-        if hasattr(cls, 'on_mapper_add_class'):
-            cls.on_mapper_add_class(self)
+        on_mapper_add_class = getattr(cls, 'on_mapper_add_class', None)
+        if on_mapper_add_class is not None:
+            on_mapper_add_class(self)
 
         # This part happens after the on_mapper_add_class has run since the
         # class has an opportunity to set its RDF type based on what we provide
@@ -148,13 +173,26 @@ class Mapper(Configurable):
     process_classes = process_class
 
     def lookup_module(self, module_name):
-        m = self.modules.get(module_name, None)
-        if m is None:
-            for p in self.imported_mappers:
-                m = p.lookup_module(module_name)
-                if m:
-                    break
-        return m
+        for mapper in self._mapper_chain():
+            m = mapper.modules.get(module_name, None)
+            if m:
+                return m
+        return None
+
+    def _mapper_chain(self):
+        '''
+        Yields this mapper and then, depth-first, the mappers it imports. Each mapper is
+        yielded only once, even if imported by more than one mapper.
+        '''
+        seen = set()
+        stack = [self]
+        while stack:
+            mapper = stack.pop()
+            if id(mapper) in seen:
+                continue
+            seen.add(id(mapper))
+            yield mapper
+            stack.extend(reversed(mapper.imported_mappers))
 
     def _check_is_good_class_registry(self, cls):
         module = IM.import_module(cls.__module__)
@@ -258,8 +296,9 @@ class Mapper(Configurable):
 
     def handle_mapped_classes(self, classes):
         res = []
-        for cls in classes:
-            if isinstance(cls, type) and self.add_class(cls):
+        # Super-classes are added before their sub-classes
+        for cls in _sort_classes([c for c in classes if isinstance(c, type)]):
+            if self.add_class(cls):
                 res.append(cls)
         return res
 
@@ -271,23 +310,49 @@ class Mapper(Configurable):
         return ret
 
     def _lookup_class(self, cname):
-        c = self._mapped_classes.get(cname, None)
-        if c is None:
-            for p in self.imported_mappers:
-                c = p._lookup_class(cname)
-                if c:
-                    break
+        if self._lookup_cache_generation != Mapper._generation:
+            self._lookup_cache.clear()
+            self._lookup_cache_generation = Mapper._generation
         else:
-            L.debug('%s.lookup_class("%s") %s@%s',
-                    repr(self), cname, c, hex(id(c)))
-        return c
+            try:
+                return self._lookup_cache[cname]
+            except KeyError:
+                pass
+
+        for mapper in self._mapper_chain():
+            c = mapper._mapped_classes.get(cname, None)
+            if c is not None:
+                L.debug('%s.lookup_class("%s") %s@%s',
+                        repr(mapper), cname, c, hex(id(c)))
+                # Only hits are cached: a class can be added to an imported mapper
+                # without going through `add_class`, so a cached miss could hide it
+                self._lookup_cache[cname] = c
+                return c
+        return None
 
     def mapped_classes(self):
-        for p in self.imported_mappers:
-            for c in p.mapped_classes():
-                yield
-        for c in self._mapped_classes.values():
-            yield c
+        # Imported mappers' classes come before our own
+        for mapper in self._imports_first_chain():
+            yield from mapper._mapped_classes.values()
+
+    def _imports_first_chain(self):
+        '''
+        Yields the mappers this mapper imports, depth-first and in import order, each
+        after the mappers that it imports, and then this mapper. Each mapper is yielded only
+        once, even if imported by more than one mapper.
+        '''
+        seen = {id(self)}
+        stack = [(self, iter(self.imported_mappers))]
+        while stack:
+            mapper, imports = stack[-1]
+            for imported in imports:
+                if id(imported) not in seen:
+                    seen.add(id(imported))
+                    stack.append((imported, iter(imported.imported_mappers)))
+                    break
+            else:
+                stack.pop()
+                yield mapper
 
     def __str__(self):
         if self.name is not None:
@@ -296,32 +361,55 @@ class Mapper(Configurable):
             return super(Mapper, self).__str__()
 
 
-class _ClassOrderable(object):
-    def __init__(self, cls):
-        self.cls = cls
-
-    def __eq__(self, other):
-        self.cls is other.cls
-
-    def __gt__(self, other):
-        res = False
-        ocls = other.cls
-        scls = self.cls
-        if issubclass(ocls, scls) and not issubclass(scls, ocls):
-            res = True
-        elif issubclass(scls, ocls) == issubclass(ocls, scls):
-            res = scls.__name__ > ocls.__name__
-        return res
+def _topo_rank(classes):
+    '''
+    Ranks classes such that each class has a higher rank than any of its super-classes
+    among `classes`
+
+    Parameters
+    ----------
+    classes : list of type
+        The classes to rank
+
+    Returns
+    -------
+    dict
+        Mapping from each class to its rank
+    '''
+    classes = set(classes)
+    subclasses = {c: [] for c in classes}
+    in_degree = dict()
+    for c in classes:
+        bases = [b for b in c.__mro__[1:] if b in classes]
+        in_degree[c] = len(bases)
+        for b in bases:
+            subclasses[b].append(c)
+
+    rank = dict()
+    border = [c for c, d in in_degree.items() if d == 0]
+    for c in border:
+        rank[c] = 0
+    while border:
+        c = border.pop()
+        for sc in subclasses[c]:
+            rank[sc] = max(rank.get(sc, 0), rank[c] + 1)
+            in_degree[sc] -= 1
+            if in_degree[sc] == 0:
+                border.append(sc)
+    return rank
+
+
+def _sort_classes(classes):
+    '''
+    Sorts classes so that each class comes after all of its super-classes among
+    `classes`
 
-    def __lt__(self, other):
-        res = False
-        ocls = other.cls
-        scls = self.cls
-        if issubclass(scls, ocls) and not issubclass(ocls, scls):
-            res = True
-        elif issubclass(scls, ocls) == issubclass(ocls, scls):
-            res = scls.__name__ < ocls.__name__
-        return res
+    Classes are ordered by their depth in the inheritance graph restricted to `classes`,
+    shallowest first, and then by name: for ``A``, ``Z``, and ``Zsub(Z)``, this gives
+    ``[A, Z, Zsub]``.
+    '''
+    rank = _topo_rank(classes)
+    return sorted(classes, key=lambda c: (rank[c], c.__name__))
 
 
 def parents_str(cls):
@@ -13,11 +13,12 @@ L = logging.getLogger(__name__)
 
 
 class ZeroOrMore(object):
+    __slots__ = ('identifier', 'predicate', 'direction', 'index')
+
     def __init__(self, identifier, predicate, index, direction=DOWN):
         self.identifier = identifier
         self.predicate = predicate
         self.direction = direction
-        self.direction = direction
         self.index = index
 
     def __repr__(self):
@@ -28,6 +29,7 @@ class ZeroOrMore(object):
 
 
 class SubClassModifier(ZeroOrMore):
+    __slots__ = ()
 
     def __init__(self, rdf_type):
         super().__init__(rdf_type, R.RDFS.subClassOf, 2, UP)
@@ -37,6 +39,7 @@ class SubClassModifier(ZeroOrMore):
 
 
 class SubPropertyOfModifier(ZeroOrMore):
+    __slots__ = ()
 
     def __init__(self, rdf_property):
         super().__init__(rdf_property, R.RDFS.subPropertyOf, 1, direction=UP)
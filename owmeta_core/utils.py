@@ -6,6 +6,7 @@ elsewhere in owmeta_core
 import functools
 import importlib
 import re
+from weakref import WeakKeyDictionary
 
 __all__ = ['grouper', 'slice_dict']
 
@@ -16,6 +17,8 @@ PROVIDER_PATH_FORMAT = r'''
 
 PROVIDER_PATH_RE = re.compile(PROVIDER_PATH_FORMAT, flags=re.VERBOSE)
 
+_FCN_CACHE = WeakKeyDictionary()
+
 
 def grouper(iterable, n, fillvalue=None):
     "Collect data into fixed-length chunks or blocks"
@@ -41,6 +44,21 @@ def FCN(cls):
     return str(cls.__module__) + '.' + str(cls.__name__)
 
 
+def _cached_fcn(cls):
+    '''
+    Memoized `FCN`. Entries are dropped when the class is garbage-collected
+    '''
+    try:
+        return _FCN_CACHE[cls]
+    except KeyError:
+        res = FCN(cls)
+        _FCN_CACHE[cls] = res
+        return res
+    except TypeError:
+        # Not weak-referenceable
+        return FCN(cls)
+
+
 def aslist(fun):
     @functools.wraps(fun)
     def wrapper(*args, **kwargs):
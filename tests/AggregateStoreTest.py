@@ -0,0 +1,129 @@
+import pytest
+from rdflib.term import URIRef
+try:
+    from rdflib.plugins.stores.memory import Memory  # noqa: F401
+    MEMORY_STORE_KEY = 'Memory'
+except ImportError:
+    # rdflib<6.0.0
+    MEMORY_STORE_KEY = 'IOMemory'
+
+from owmeta_core.agg_store import AggregateStore
+
+
+TRIPLE = (URIRef('http://example.org/a'),
+          URIRef('http://example.org/b'),
+          URIRef('http://example.org/c'))
+
+CTX = URIRef('http://example.org/ctx')
+
+OTHER_CTX = URIRef('http://example.org/other_ctx')
+
+
+def aggregate_store(**kwargs):
+    cut = AggregateStore(**kwargs)
+    cut.open([(MEMORY_STORE_KEY, None), (MEMORY_STORE_KEY, None)])
+    for store in cut.stores:
+        store.add(TRIPLE, context=CTX)
+        store.bind('ex', URIRef('http://example.org/'))
+    return cut
+
+
+def context_ids(results):
+    return [(t, set(getattr(c, 'identifier', c) for c in ctxs)) for t, ctxs in results]
+
+
+def test_triples_duplicates():
+    cut = aggregate_store()
+    assert 2 == sum(1 for _ in cut.triples((None, None, None)))
+
+
+def test_triples_dedup():
+    cut = aggregate_store(dedup=True)
+    assert [TRIPLE] == [t for t, _ in cut.triples((None, None, None))]
+
+
+def test_triples_dedup_merges_contexts():
+    cut = AggregateStore(dedup=True)
+    cut.open([(MEMORY_STORE_KEY, None), (MEMORY_STORE_KEY, None)])
+    cut.stores[0].add(TRIPLE, context=CTX)
+    cut.stores[1].add(TRIPLE, context=OTHER_CTX)
+    assert [(TRIPLE, {CTX, OTHER_CTX})] == context_ids(cut.triples((None, None, None)))
+
+
+def test_triples_choices_dedup_merges_contexts():
+    cut = AggregateStore(dedup=True)
+    cut.open([(MEMORY_STORE_KEY, None), (MEMORY_STORE_KEY, None)])
+    cut.stores[0].add(TRIPLE, context=CTX)
+    cut.stores[1].add(TRIPLE, context=OTHER_CTX)
+    assert [(TRIPLE, {CTX, OTHER_CTX})] == context_ids(
+            cut.triples_choices((None, None, [TRIPLE[2]])))
+
+
+def test_dedup_from_configuration():
+    cut = AggregateStore()
+    cut.open({'stores': [(MEMORY_STORE_KEY, None), (MEMORY_STORE_KEY, None)],
+              'dedup': True})
+    assert cut.dedup
+
+
+def test_dedup_off_by_default_in_configuration():
+    cut = AggregateStore()
+    cut.open({'stores': [(MEMORY_STORE_KEY, None), (MEMORY_STORE_KEY, None)]})
+    assert not cut.dedup
+
+
+def test_configuration_missing_stores():
+    cut = AggregateStore()
+    with pytest.raises(ValueError):
+        cut.open({'dedup': True})
+
+
+def test_contexts_dedup():
+    cut = aggregate_store(dedup=True)
+    assert [CTX] == [getattr(c, 'identifier', c) for c in cut.contexts()]
+
+
+def test_namespaces_dedup():
+    cut = aggregate_store(dedup=True)
+    assert 1 == sum(1 for ns in cut.namespaces() if ns[0] == 'ex')
+
+
+def test_stores_immutable():
+    cut = aggregate_store()
+    assert isinstance(cut.stores, tuple)
+
+
+def test_single_store_triples():
+    cut = AggregateStore()
+    cut.open([(MEMORY_STORE_KEY, None)])
+    cut.stores[0].add(TRIPLE, context=CTX)
+    assert [TRIPLE] == [t for t, _ in cut.triples((None, None, None))]
+
+
+def test_single_store_len():
+    cut = AggregateStore()
+    cut.open([(MEMORY_STORE_KEY, None)])
+    cut.stores[0].add(TRIPLE, context=CTX)
+    assert 1 == len(cut)
+
+
+def test_namespace():
+    cut = aggregate_store()
+    assert URIRef('http://example.org/') == cut.namespace('ex')
+
+
+def test_namespace_missing():
+    cut = aggregate_store()
+    assert cut.namespace('nope') is None
+    cut.bind('nope', URIRef('http://example.org/nope#'))
+    assert URIRef('http://example.org/nope#') == cut.namespace('nope')
+
+
+def test_prefix():
+    cut = aggregate_store()
+    assert 'ex' == cut.prefix(URIRef('http://example.org/'))
+
+
+def test_repr():
+    cut = aggregate_store()
+    assert repr(cut).startswith('owmeta_core.agg_store.AggregateStore(')
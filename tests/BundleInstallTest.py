@@ -1,10 +1,11 @@
 from collections import namedtuple
+import hashlib
 import json
-from os import listdir, makedirs
+from itertools import count
+from os import listdir, makedirs, mkdir
 from os.path import join as p, isdir, isfile
 import transaction
 from unittest.mock import patch
-from tempfile import TemporaryDirectory
 
 import pytest
 import rdflib
@@ -15,16 +16,24 @@ from owmeta_core.bundle import (Installer, Descriptor, make_include_func, FilesD
                                 Remote, Bundle, BUNDLE_MANIFEST_FILE_NAME)
 from owmeta_core.context import IMPORTS_CONTEXT_KEY, CLASS_REGISTRY_CONTEXT_KEY
 from owmeta_core.context_common import CONTEXT_IMPORTS
+from owmeta_core.file_utils import hash_file
 
 
 Dirs = namedtuple('Dirs', ('source_directory', 'bundles_directory'))
 
 
+_dirs_counter = count()
+
+
 @pytest.fixture
-def dirs():
-    with TemporaryDirectory() as source_directory,\
-            TemporaryDirectory() as bundles_directory:
-        yield Dirs(source_directory, bundles_directory)
+def dirs(tmp_root):
+    # The directories are removed along with `tmp_root` at the end of the session rather
+    # than after each test
+    n = next(_dirs_counter)
+    res = Dirs(p(tmp_root, f'install_src{n}'), p(tmp_root, f'install_bundles{n}'))
+    mkdir(res.source_directory)
+    mkdir(res.bundles_directory)
+    yield res
 
 
 def test_bundle_install_directory(dirs):
@@ -109,6 +118,24 @@ def test_multiple_context_hash(dirs):
         assert ctxid_2.encode('UTF-8') in contents
 
 
+def test_custom_include_func(dirs):
+    d = Descriptor('test')
+    ctxid_1 = 'http://example.org/ctx1'
+    ctxid_2 = 'http://example.org/ctx2'
+    d.includes.add(make_include_func(ctxid_1))
+    d.includes.add(lambda ctx: str(ctx) == ctxid_2)
+    g = rdflib.ConjunctiveGraph()
+    g.get_context(ctxid_1).add((aURI('a'), aURI('b'), aURI('c')))
+    g.get_context(ctxid_2).add((aURI('d'), aURI('e'), aURI('f')))
+    g.get_context('http://example.org/ctx3').add((aURI('g'), aURI('h'), aURI('i')))
+
+    bi = Installer(*dirs, graph=g)
+    bi.install(d)
+    with open(p(dirs.bundles_directory, 'test', '1', 'graphs', 'index'), 'rb') as f:
+        ctxids = {line.split(b'\x00')[0] for line in f}
+    assert {ctxid_1.encode('UTF-8'), ctxid_2.encode('UTF-8')} == ctxids
+
+
 def test_no_dupe(dirs):
     '''
     Test that if we have two contexts with the same contents that we don't create more
@@ -137,6 +164,27 @@ def test_no_dupe(dirs):
     assert len(graph_files) == 1
 
 
+def test_graph_file_named_by_content_hash(dirs):
+    d = Descriptor('test')
+    ctxid = 'http://example.org/ctx1'
+    d.includes.add(make_include_func(ctxid))
+    g = rdflib.ConjunctiveGraph()
+    cg = g.get_context(ctxid)
+    with transaction.manager:
+        cg.add((aURI('a'), aURI('b'), aURI('c')))
+        cg.add((aURI('a'), aURI('b'), rdflib.Literal('d\ne')))
+
+    bi = Installer(*dirs, graph=g)
+    bi.install(d)
+
+    graphs_directory = p(dirs.bundles_directory, 'test', '1', 'graphs')
+    with open(p(graphs_directory, 'index')) as f:
+        _, gbname = f.read().strip().split('\x00')
+    hsh = hashlib.sha224()
+    hash_file(hsh, p(graphs_directory, gbname))
+    assert gbname == hsh.hexdigest() + '.nt'
+
+
 def test_file_copy(dirs):
     d = Descriptor('test')
     open(p(dirs[0], 'somefile'), 'w').close()
@@ -185,6 +233,22 @@ def test_file_hash_content(dirs):
         assert b'somefile' in contents
 
 
+def test_file_copy_hash_matches_content(dirs):
+    d = Descriptor('test')
+    data = b'some data' * 10000
+    with open(p(dirs[0], 'somefile'), 'wb') as f:
+        f.write(data)
+    d.files = FilesDescriptor()
+    d.files.includes.add('somefile')
+    bi = Installer(*dirs, graph=rdflib.ConjunctiveGraph())
+    bi.install(d)
+    files_directory = p(dirs.bundles_directory, 'test', '1', 'files')
+    with open(p(files_directory, 'somefile'), 'rb') as f:
+        assert data == f.read()
+    with open(p(files_directory, 'hashes'), 'rb') as f:
+        assert hashlib.sha224(data).digest() in f.read()
+
+
 def test_uncovered_imports(dirs):
     '''
     If we have imports and no dependencies, then thrown an exception if we have not
@@ -500,5 +564,65 @@ def test_dependency_version_in_manifest_without_spec(dirs):
     assert test_bnd.manifest_data['dependencies'][0]['version'] == 1
 
 
+def test_dependency_bundle_reused_across_installs(dirs):
+    ctxid_1 = 'http://example.org/ctx1'
+    ctxid_2 = 'http://example.org/ctx2'
+    dep_d = Descriptor('dep', version=1)
+    dep_d.includes.add(make_include_func(ctxid_2))
+
+    g = rdflib.ConjunctiveGraph()
+    g.get_context(ctxid_1).add((aURI('a'), aURI('b'), aURI('c')))
+    g.get_context(ctxid_2).add((aURI('d'), aURI('e'), aURI('f')))
+
+    bi = Installer(*dirs, graph=g)
+    bi.install(dep_d)
+    for ident in ('test1', 'test2'):
+        d = Descriptor(ident)
+        d.includes.add(make_include_func(ctxid_1))
+        d.dependencies.add(DependencyDescriptor('dep', 1))
+        bi.install(d)
+
+    with patch('owmeta_core.bundle.Bundle') as Bundle_mock:
+        bnd = bi._dd_to_bundle(DependencyDescriptor('dep', 1))
+    Bundle_mock.assert_not_called()
+    assert 1 == bnd.version
+    assert {ctxid_2} == set(bnd.contexts)
+
+
+def test_dependency_bundle_forgotten_on_new_version(dirs):
+    ctxid = 'http://example.org/ctx1'
+    g = rdflib.ConjunctiveGraph()
+    g.get_context(ctxid).add((aURI('a'), aURI('b'), aURI('c')))
+    bi = Installer(*dirs, graph=g)
+    dep_d = Descriptor('dep')
+    dep_d.includes.add(make_include_func(ctxid))
+    bi.install(dep_d)
+    dd = DependencyDescriptor('dep')
+    bnd = bi._dd_to_bundle(dd)
+
+    dep_d.version = 2
+    bi.install(dep_d)
+    assert bi._dd_to_bundle(dd) is not bnd
+
+
+def test_unversioned_dependency_sees_version_from_other_installer(dirs):
+    ctxid_1 = 'http://example.org/ctx1'
+    ctxid_2 = 'http://example.org/ctx2'
+    g = rdflib.ConjunctiveGraph()
+    g.get_context(ctxid_1).add((aURI('a'), aURI('b'), aURI('c')))
+    g.get_context(ctxid_2).add((aURI('d'), aURI('e'), aURI('f')))
+    dep_d = Descriptor('dep', version=1)
+    dep_d.includes.add(make_include_func(ctxid_1))
+    bi = Installer(*dirs, graph=g)
+    bi.install(dep_d)
+    dd = DependencyDescriptor('dep')
+    assert {ctxid_1} == set(bi._dd_to_bundle(dd).contexts)
+
+    dep_d.version = 2
+    dep_d.includes.add(make_include_func(ctxid_2))
+    Installer(*dirs, graph=g).install(dep_d)
+    assert {ctxid_1, ctxid_2} == set(bi._dd_to_bundle(dd).contexts)
+
+
 def aURI(c):
     return URIRef(f'http://example.org/uri#{c}')
@@ -1,5 +1,8 @@
+from collections import deque
 from io import StringIO
-from unittest.mock import patch, Mock
+from unittest.mock import Mock
+
+import pytest
 
 from owmeta_core.bundle import Remote, URLConfig
 from owmeta_core.bundle.loaders import load_entry_point_loaders
@@ -46,20 +49,15 @@ def test_remote_inequality_by_name():
     assert cut1 != cut2
 
 
-def test_write_read_remote_1():
+@pytest.mark.parametrize('urls', [
+    [],
+    ['http://example.org/bundle_remote0',
+     'http://example.org/bundle_remote1']], ids=['no_configs', 'two_configs'])
+def test_write_read_remote(urls):
     out = StringIO()
     r0 = Remote('remote')
-    r0.write(out)
-    out.seek(0)
-    r1 = Remote.read(out)
-    assert r0 == r1
-
-
-def test_write_read_remote_2():
-    out = StringIO()
-    r0 = Remote('remote')
-    r0.add_config(URLConfig('http://example.org/bundle_remote0'))
-    r0.add_config(URLConfig('http://example.org/bundle_remote1'))
+    for url in urls:
+        r0.add_config(URLConfig(url))
     r0.write(out)
     out.seek(0)
     r1 = Remote.read(out)
@@ -74,30 +72,28 @@ def test_get_http_url_loaders():
     load_entry_point_loaders()
     r0 = Remote('remote')
     r0.add_config(URLConfig('http://example.org/bundle_remote0'))
-    for l in r0.generate_loaders():
-        if isinstance(l, HTTPBundleLoader):
-            return
-
-    raise AssertionError('No HTTPBundleLoader was created')
+    assert any(isinstance(l, HTTPBundleLoader) for l in r0.generate_loaders()), \
+        'No HTTPBundleLoader was created'
 
 
-def test_remote_generate_uploaders_skip():
+@pytest.fixture
+def patched_uploader(monkeypatch):
     mock = Mock()
-    with patch('owmeta_core.bundle.UPLOADER_CLASSES', [mock]):
-        r0 = Remote('remote')
-        r0.add_config(URLConfig('http://example.org/bundle_remote0'))
-        for ul in r0.generate_uploaders():
-            pass
-    mock.can_upload_to.assert_called()
+    monkeypatch.setattr('owmeta_core.bundle.UPLOADER_CLASSES', [mock])
+    return mock
 
 
-def test_remote_generate_uploaders_no_skip():
-    mock = Mock()
-    mock.can_upload_to.return_value = True
+def test_remote_generate_uploaders_skip(patched_uploader):
+    r0 = Remote('remote')
+    r0.add_config(URLConfig('http://example.org/bundle_remote0'))
+    deque(r0.generate_uploaders(), maxlen=0)
+    patched_uploader.can_upload_to.assert_called()
+
+
+def test_remote_generate_uploaders_no_skip(patched_uploader):
+    patched_uploader.can_upload_to.return_value = True
     ac = URLConfig('http://example.org/bundle_remote0')
-    with patch('owmeta_core.bundle.UPLOADER_CLASSES', [mock]):
-        r0 = Remote('remote')
-        r0.add_config(ac)
-        for ul in r0.generate_uploaders():
-            pass
-    mock.assert_called_with(ac)
+    r0 = Remote('remote')
+    r0.add_config(ac)
+    deque(r0.generate_uploaders(), maxlen=0)
+    patched_uploader.assert_called_with(ac)
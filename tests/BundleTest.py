@@ -1,9 +1,11 @@
 from collections import namedtuple
+from copy import deepcopy
+from functools import lru_cache
 import json
+import os
 from os.path import join as p
-from os import makedirs, chmod
+from os import makedirs, mkdir, chmod, scandir
 from pathlib import Path
-from tempfile import TemporaryDirectory
 from unittest.mock import patch, Mock, ANY
 import shutil
 
@@ -15,22 +17,79 @@ import transaction
 import ZODB
 
 from owmeta_core.context import Context
-from owmeta_core.contextualize import Contextualizable
 from owmeta_core.bundle import (Bundle, BundleNotFound, Descriptor, DependencyDescriptor,
                                 _RemoteHandlerMixin, make_include_func, NoRemoteAvailable,
                                 DEFAULT_BUNDLES_DIRECTORY)
 from owmeta_core.bundle.common import (find_bundle_directory, BUNDLE_MANIFEST_FILE_NAME,
-                                       BundleTreeFileIgnorer, BUNDLE_INDEXED_DB_NAME)
+                                       BundleTreeFileIgnorer, BUNDLE_INDEXED_DB_NAME,
+                                       directory_is_empty)
 
 
-Dirs = namedtuple('Dirs', ('source_directory', 'bundles_directory'))
+SUB = URIRef('http://example.org/sub')
+PROP = URIRef('http://example.org/prop')
+OBJ = URIRef('http://example.org/obj')
+TRIP = (SUB, PROP, OBJ)
+CTX_URI = URIRef('http://example.com/ctx')
+OTHER_CTX_URI = URIRef('http://example.com/other_ctx')
+
+DEP_DESC_SRC = '''
+id: dep
+includes:
+  - http://example.com/ctx
+'''
+
+DEP_CTXG_DESC_SRC = '''
+id: dep
+includes:
+  - http://example.com/ctxg
+'''
+
+TEST_DESC_SRC = '''
+id: test
+dependencies:
+  - dep
+'''
+
+
+@lru_cache(maxsize=None)
+def _load_descriptor(src):
+    return Descriptor.load(src)
+
+
+def load_descriptor(src):
+    '''
+    Loads a `Descriptor` from YAML, parsing each distinct source only once. Returns a copy
+    so tests can't affect each other through the cached descriptor.
+    '''
+    return deepcopy(_load_descriptor(src))
 
 
 @pytest.fixture
-def dirs():
-    with TemporaryDirectory() as source_directory,\
-            TemporaryDirectory() as bundles_directory:
-        yield Dirs(source_directory, bundles_directory)
+def bundles_directory(tmp_root, request):
+    '''
+    Path for a bundles directory, unique to the test, under the session `tmp_root`. The
+    directory is not created
+    '''
+    res = p(tmp_root, 'bundles-' + request.node.name)
+    yield res
+    shutil.rmtree(res, ignore_errors=True)
+
+
+def make_versions(bundles_directory, ident, *versions):
+    '''
+    Make a bundle root for `ident` with a sub-directory for each of `versions`, creating
+    intermediate directories only once
+
+    Returns
+    -------
+    str
+        The bundle root directory
+    '''
+    bundle_root = p(bundles_directory, ident)
+    makedirs(bundle_root)
+    for v in versions:
+        mkdir(p(bundle_root, v))
+    return bundle_root
 
 
 def test_bundle_None_ident():
@@ -50,79 +109,96 @@ def test_bundles_directory_None():
         assert realpath(expandvars(expanduser(DEFAULT_BUNDLES_DIRECTORY))) == Bundle('test', None).bundles_directory
 
 
-def test_latest_bundle_fetched(tempdir):
-    bundles_directory = p(tempdir, 'bundles')
-    makedirs(p(bundles_directory, 'example', '1'))
-    makedirs(p(bundles_directory, 'example', '2'))
-    expected = p(bundles_directory, 'example', '3')
-    makedirs(expected)
+def test_latest_bundle_fetched(bundles_directory):
+    bundle_root = make_versions(bundles_directory, 'example', '1', '2', '3')
+    expected = p(bundle_root, '3')
     b = Bundle('example', bundles_directory=bundles_directory)
     assert expected == b._get_bundle_directory()
 
 
-def test_specified_version_fetched(tempdir):
-    bundles_directory = p(tempdir, 'bundles')
-    makedirs(p(bundles_directory, 'example', '1'))
-    expected = p(bundles_directory, 'example', '2')
-    makedirs(expected)
-    makedirs(p(bundles_directory, 'example', '3'))
+def test_specified_version_fetched(bundles_directory):
+    bundle_root = make_versions(bundles_directory, 'example', '1', '2', '3')
+    expected = p(bundle_root, '2')
     b = Bundle('example', version=2, bundles_directory=bundles_directory)
     assert expected == b._get_bundle_directory()
 
 
-def test_no_versioned_bundles(tempdir):
-    bundles_directory = p(tempdir, 'bundles')
+def test_no_versioned_bundles(bundles_directory):
     makedirs(p(bundles_directory, 'example'))
     b = Bundle('example', bundles_directory=bundles_directory)
-    with pytest.raises(BundleNotFound, match='No versioned bundle directories'):
+    with pytest.raises(BundleNotFound) as excinfo:
         b._get_bundle_directory()
+    assert 'No versioned bundle directories' in str(excinfo.value)
 
 
-def test_specified_bundle_does_not_exist(tempdir):
-    bundles_directory = p(tempdir, 'bundles')
+def test_specified_bundle_does_not_exist(bundles_directory):
     makedirs(p(bundles_directory, 'example'))
     b = Bundle('example', bundles_directory=bundles_directory, version=2)
     with pytest.raises(BundleNotFound, match='at version 2.*specified version'):
         b._get_bundle_directory()
 
 
-def test_specified_bundle_directory_does_not_exist(tempdir):
-    bundles_directory = p(tempdir, 'bundles')
+def test_specified_bundle_directory_does_not_exist(bundles_directory):
     makedirs(bundles_directory)
     b = Bundle('example', bundles_directory=bundles_directory)
-    with pytest.raises(BundleNotFound, match='Bundle directory'):
+    with pytest.raises(BundleNotFound) as excinfo:
         b._get_bundle_directory()
+    assert 'Bundle directory' in str(excinfo.value)
 
 
-def test_specified_bundles_root_directory_does_not_exist(tempdir):
-    bundles_directory = p(tempdir, 'bundles')
+def test_specified_bundles_root_directory_does_not_exist(tmp_root):
+    # Nothing is written, so there's no need for a directory of our own
+    bundles_directory = p(tmp_root, 'nonexistent_bundles')
     b = Bundle('example', bundles_directory=bundles_directory)
-    with pytest.raises(BundleNotFound, match='Bundle directory'):
+    with pytest.raises(BundleNotFound) as excinfo:
         b._get_bundle_directory()
+    assert 'Bundle directory' in str(excinfo.value)
 
 
-def test_specified_bundles_root_permission_denied(tempdir):
-    bundles_directory = p(tempdir, 'bundles')
+@pytest.mark.skipif(hasattr(os, 'geteuid') and os.geteuid() == 0,
+                    reason='root bypasses mode bits')
+def test_specified_bundles_root_permission_denied(bundles_directory, request):
     b = Bundle('example', bundles_directory=bundles_directory)
     makedirs(bundles_directory)
     chmod(bundles_directory, 0)
-    try:
-        with pytest.raises(OSError, match='[Pp]ermission denied'):
-            b._get_bundle_directory()
-    finally:
-        chmod(bundles_directory, 0o777)
+    # Runs before the bundles_directory teardown so it can remove the directory
+    request.addfinalizer(lambda: chmod(bundles_directory, 0o777))
+    with pytest.raises(OSError, match='[Pp]ermission denied'):
+        b._get_bundle_directory()
 
 
-def test_ignore_non_version_number(tempdir):
-    bundles_directory = p(tempdir, 'bundles')
+def test_ignore_non_version_number(bundles_directory):
     b = Bundle('example', bundles_directory=bundles_directory)
-    makedirs(p(bundles_directory, 'example', 'ignore_me'))
-    expected = p(bundles_directory, 'example', '5')
-    makedirs(expected)
+    bundle_root = make_versions(bundles_directory, 'example', 'ignore_me', '5')
+    expected = p(bundle_root, '5')
     actual = b._get_bundle_directory()
     assert actual == expected
 
 
+def test_latest_bundle_single_directory_scan(bundles_directory):
+    make_versions(bundles_directory, 'example', '1', '2')
+    b = Bundle('example', bundles_directory=bundles_directory)
+    with patch('owmeta_core.bundle.common.scandir', wraps=scandir) as scandir_mock, \
+            patch('os.listdir') as listdir_mock:
+        b._get_bundle_directory()
+    scandir_mock.assert_called_once()
+    listdir_mock.assert_not_called()
+
+
+def test_directory_is_empty(tempdir):
+    assert directory_is_empty(tempdir)
+
+
+def test_directory_is_not_empty(tempdir):
+    makedirs(p(tempdir, 'sub'))
+    assert not directory_is_empty(tempdir)
+
+
+def test_directory_is_empty_missing(tempdir):
+    with pytest.raises(FileNotFoundError):
+        directory_is_empty(p(tempdir, 'missing'))
+
+
 def test_descriptor_dependency():
     d = Descriptor.make({
         'id': 'testBundle',
@@ -133,10 +209,10 @@ def test_descriptor_dependency():
             ('dep4',)
         ]
     })
-    assert DependencyDescriptor('dep1') in d.dependencies
-    assert DependencyDescriptor('dep2', 2) in d.dependencies
-    assert DependencyDescriptor('dep3', 4) in d.dependencies
-    assert DependencyDescriptor('dep4') in d.dependencies
+    assert {DependencyDescriptor('dep1'),
+            DependencyDescriptor('dep2', 2),
+            DependencyDescriptor('dep3', 4),
+            DependencyDescriptor('dep4')} <= set(d.dependencies)
 
 
 def test_descriptor_includes_extra_key():
@@ -169,206 +245,86 @@ def test_descriptor_includes_empty_false():
     assert not d.empties
 
 
-def test_triple_in_dependency(custom_bundle):
-    dep_desc = Descriptor.load('''
-    id: dep
-    includes:
-      - http://example.com/ctx
-    ''')
-
-    test_desc = Descriptor.load('''
-    id: test
-    dependencies:
-      - dep
-    ''')
-
-    depgraph = ConjunctiveGraph()
-    ctx_graph = depgraph.get_context('http://example.com/ctx')
-    trip = (URIRef('http://example.org/sub'), URIRef('http://example.org/prop'), URIRef('http://example.org/obj'))
-    ctx_graph.add(trip)
-
-    with custom_bundle(dep_desc, graph=depgraph) as depbun, \
-            custom_bundle(test_desc, bundles_directory=depbun.bundles_directory) as testbun, \
-            Bundle('test', bundles_directory=testbun.bundles_directory) as bnd:
-        assert trip in bnd.rdf
+ExampleCtxGraph = namedtuple('ExampleCtxGraph', ('graph', 'ctx_graph', 'quad'))
 
+SharedDepBundles = namedtuple('SharedDepBundles', ('bundles_directory', 'ctx_graph', 'quad'))
 
-def test_quad_in_dependency(custom_bundle):
-    dep_desc = Descriptor.load('''
-    id: dep
-    includes:
-      - http://example.com/ctx
-    ''')
-
-    test_desc = Descriptor.load('''
-    id: test
-    dependencies:
-      - dep
-    ''')
 
+@pytest.fixture(scope='module')
+def example_ctx_graph():
+    '''
+    A graph with one quad in ``http://example.com/ctx``. Must not be modified by tests
+    '''
     depgraph = ConjunctiveGraph()
-    ctx_graph = depgraph.get_context('http://example.com/ctx')
-    quad = (URIRef('http://example.org/sub'), URIRef('http://example.org/prop'), URIRef('http://example.org/obj'),
-            ctx_graph)
+    ctx_graph = depgraph.get_context(CTX_URI)
+    quad = TRIP + (ctx_graph,)
     depgraph.add(quad)
+    return ExampleCtxGraph(depgraph, ctx_graph, quad)
 
-    with custom_bundle(dep_desc, graph=depgraph) as depbun, \
-            custom_bundle(test_desc, bundles_directory=depbun.bundles_directory) as testbun, \
-            Bundle('test', bundles_directory=testbun.bundles_directory) as bnd:
-        assert quad in bnd.rdf
-
-
-def test_quad_not_in_dependency(custom_bundle):
-    dep_desc = Descriptor.load('''
-    id: dep
-    includes:
-      - http://example.com/ctx
-    ''')
-
-    test_desc = Descriptor.load('''
-    id: test
-    dependencies:
-      - dep
-    ''')
 
-    depgraph = ConjunctiveGraph()
-    ctx_graph = depgraph.get_context('http://example.com/other_ctx')
-    quad = (URIRef('http://example.org/sub'), URIRef('http://example.org/prop'), URIRef('http://example.org/obj'),
-            ctx_graph)
-    depgraph.add(quad)
+@pytest.fixture(scope='module')
+def shared_dep_bundles(custom_bundle, example_ctx_graph):
+    '''
+    A "test" bundle depending on a "dep" bundle with one triple in
+    ``http://example.com/ctx``. Installed once for the tests that only read from it
+    '''
+    dep_desc = load_descriptor(DEP_DESC_SRC)
+    test_desc = load_descriptor(TEST_DESC_SRC)
+    depgraph, ctx_graph, quad = example_ctx_graph
 
     with custom_bundle(dep_desc, graph=depgraph) as depbun, \
-            custom_bundle(test_desc, bundles_directory=depbun.bundles_directory) as testbun, \
-            Bundle('test', bundles_directory=testbun.bundles_directory) as bnd:
-        assert quad not in bnd.rdf
+            custom_bundle(test_desc, bundles_directory=depbun.bundles_directory) as testbun:
+        yield SharedDepBundles(testbun.bundles_directory, ctx_graph, quad)
 
 
-def test_triples_choices(custom_bundle):
-    dep_desc = Descriptor.load('''
-    id: dep
-    includes:
-      - http://example.com/ctx
-    ''')
+@pytest.mark.parametrize('statement_length', [3, 4], ids=['triple', 'quad'])
+def test_statement_in_dependency(shared_dep_bundles, statement_length):
+    statement = shared_dep_bundles.quad[:statement_length]
+    with Bundle('test', bundles_directory=shared_dep_bundles.bundles_directory) as bnd:
+        assert statement in bnd.rdf
 
-    test_desc = Descriptor.load('''
-    id: test
-    dependencies:
-      - dep
-    ''')
+
+def test_quad_not_in_dependency(custom_bundle):
+    dep_desc = load_descriptor(DEP_DESC_SRC)
+    test_desc = load_descriptor(TEST_DESC_SRC)
 
     depgraph = ConjunctiveGraph()
-    ctx_graph = depgraph.get_context('http://example.com/ctx')
-    quad = (URIRef('http://example.org/sub'), URIRef('http://example.org/prop'), URIRef('http://example.org/obj'),
-            ctx_graph)
+    ctx_graph = depgraph.get_context(OTHER_CTX_URI)
+    quad = TRIP + (ctx_graph,)
     depgraph.add(quad)
 
     with custom_bundle(dep_desc, graph=depgraph) as depbun, \
             custom_bundle(test_desc, bundles_directory=depbun.bundles_directory) as testbun, \
             Bundle('test', bundles_directory=testbun.bundles_directory) as bnd:
-        match = False
-        for x in bnd.rdf.triples_choices(
-                (URIRef('http://example.org/sub'),
-                 URIRef('http://example.org/prop'),
-                 [URIRef('http://example.org/obj')])):
-            match = True
-            break
-        assert match
+        assert quad not in bnd.rdf
 
 
-def test_triples_choices_context(custom_bundle):
-    dep_desc = Descriptor.load('''
-    id: dep
-    includes:
-      - http://example.com/ctx
-    ''')
+@pytest.mark.parametrize('use_context', [False, True], ids=['no_context', 'context'])
+def test_triples_choices(shared_dep_bundles, use_context):
+    ctx_graph = shared_dep_bundles.ctx_graph if use_context else None
+    with Bundle('test', bundles_directory=shared_dep_bundles.bundles_directory) as bnd:
+        assert next(bnd.rdf.triples_choices((SUB, PROP, [OBJ]), context=ctx_graph),
+                    None) is not None
 
-    test_desc = Descriptor.load('''
-    id: test
-    dependencies:
-      - dep
-    ''')
 
-    depgraph = ConjunctiveGraph()
-    ctx_graph = depgraph.get_context('http://example.com/ctx')
-    quad = (URIRef('http://example.org/sub'), URIRef('http://example.org/prop'), URIRef('http://example.org/obj'),
-            ctx_graph)
-    depgraph.add(quad)
+def test_triples_choices_context_not_included(custom_bundle, example_ctx_graph):
+    dep_desc = load_descriptor(DEP_CTXG_DESC_SRC)
+    test_desc = load_descriptor(TEST_DESC_SRC)
+    depgraph, ctx_graph, _ = example_ctx_graph
 
     with custom_bundle(dep_desc, graph=depgraph) as depbun, \
             custom_bundle(test_desc, bundles_directory=depbun.bundles_directory) as testbun, \
             Bundle('test', bundles_directory=testbun.bundles_directory) as bnd:
-        match = False
-        for x in bnd.rdf.triples_choices(
-                (URIRef('http://example.org/sub'),
-                 URIRef('http://example.org/prop'),
-                 [URIRef('http://example.org/obj')]),
-                context=ctx_graph):
-            match = True
-            break
-        assert match
-
-
-def test_triples_choices_context_not_included(custom_bundle):
-    dep_desc = Descriptor.load('''
-    id: dep
-    includes:
-      - http://example.com/ctxg
-    ''')
+        assert next(bnd.rdf.triples_choices((SUB, PROP, [OBJ]), context=ctx_graph),
+                    None) is None
 
-    test_desc = Descriptor.load('''
-    id: test
-    dependencies:
-      - dep
-    ''')
-
-    depgraph = ConjunctiveGraph()
-    ctx_graph = depgraph.get_context('http://example.com/ctx')
-    quad = (URIRef('http://example.org/sub'), URIRef('http://example.org/prop'), URIRef('http://example.org/obj'),
-            ctx_graph)
-    depgraph.add(quad)
-
-    with custom_bundle(dep_desc, graph=depgraph) as depbun, \
-            custom_bundle(test_desc, bundles_directory=depbun.bundles_directory) as testbun, \
-            Bundle('test', bundles_directory=testbun.bundles_directory) as bnd:
-        match = False
-        for x in bnd.rdf.triples_choices(
-                (URIRef('http://example.org/sub'),
-                 URIRef('http://example.org/prop'),
-                 [URIRef('http://example.org/obj')]),
-                context=ctx_graph):
-            match = True
-        assert not match
-
-
-def test_add_to_graph_not_supported(custom_bundle):
-    dep_desc = Descriptor.load('''
-    id: dep
-    includes:
-      - http://example.com/ctx
-    ''')
 
-    test_desc = Descriptor.load('''
-    id: test
-    dependencies:
-      - dep
-    ''')
-
-    depgraph = ConjunctiveGraph()
-    ctx_graph = depgraph.get_context('http://example.com/ctx')
-    quad = (URIRef('http://example.org/sub'), URIRef('http://example.org/prop'), URIRef('http://example.org/obj'),
-            ctx_graph)
-    depgraph.add(quad)
-
-    with custom_bundle(dep_desc, graph=depgraph) as depbun, \
-            custom_bundle(test_desc, bundles_directory=depbun.bundles_directory) as testbun, \
-            Bundle('test', bundles_directory=testbun.bundles_directory) as bnd:
+def test_add_to_graph_not_supported(shared_dep_bundles):
+    with Bundle('test', bundles_directory=shared_dep_bundles.bundles_directory) as bnd:
 
         with pytest.raises(ZODB.POSException.ReadOnlyError):
             with transaction.manager:
-                bnd.rdf.add(
-                    (URIRef('http://example.org/sub'),
-                     URIRef('http://example.org/prop'),
-                     URIRef('http://example.org/obj')))
+                bnd.rdf.add(TRIP)
 
 
 def test_remote_handler_mixin_configured_remotes():
@@ -411,7 +367,7 @@ def test_bundle_contextualize_non_contextualizable(test_bundle):
 def test_bundle_contextualize(test_bundle):
     with Bundle(test_bundle.descriptor.id, version=test_bundle.descriptor.version,
             bundles_directory=test_bundle.bundles_directory) as cut:
-        ctxble = Mock(spec=Contextualizable)
+        ctxble = Mock(spec=['contextualize'])
         cut(ctxble)
         ctxble.contextualize.assert_called_with(ContextWithNoId())
 
@@ -462,9 +418,8 @@ def test_transitive_dep_null_context_triples_no_imports(custom_bundle):
     ''')
 
     depgraph = ConjunctiveGraph()
-    ctx_graph = depgraph.get_context('http://example.com/ctx')
-    quad = (URIRef('http://example.org/sub'), URIRef('http://example.org/prop'), URIRef('http://example.org/obj'),
-            ctx_graph)
+    ctx_graph = depgraph.get_context(CTX_URI)
+    quad = TRIP + (ctx_graph,)
     depgraph.add(quad)
 
     with custom_bundle(dep_dep_desc, graph=depgraph) as depdepbun, \
@@ -498,10 +453,8 @@ def test_bundle_store_conf_with_two_dep_levels(custom_bundle):
 
     # Add some triples so the contexts aren't empty -- we can't save an empty context
     g = rdflib.ConjunctiveGraph()
-    cg_1 = g.get_context(ctxid_1)
-    cg_2 = g.get_context(ctxid_2)
-    cg_1.add((aURI('a'), aURI('b'), aURI('c')))
-    cg_2.add((aURI('d'), aURI('e'), aURI('f')))
+    g.addN([(aURI('a'), aURI('b'), aURI('c'), g.get_context(ctxid_1)),
+            (aURI('d'), aURI('e'), aURI('f'), g.get_context(ctxid_2))])
 
     # End setup
 
@@ -509,21 +462,8 @@ def test_bundle_store_conf_with_two_dep_levels(custom_bundle):
             custom_bundle(dep_d, bundles_directory=depdepbun.bundles_directory) as depbun, \
             custom_bundle(d, bundles_directory=depbun.bundles_directory) as testbun, \
             Bundle('test', bundles_directory=testbun.bundles_directory) as bnd:
-        assert bnd.conf['rdf.store_conf'] == [
-                ('FileStorageZODB', dict(
-                    url=p(testbun.bundle_directory, BUNDLE_INDEXED_DB_NAME),
-                    read_only=True)),
-                # dep
-                ('owmeta_core_bds', dict(type='agg', conf=[
-                    ('FileStorageZODB', dict(
-                        url=p(depbun.bundle_directory, BUNDLE_INDEXED_DB_NAME),
-                        read_only=True)),
-                    ('owmeta_core_bds', dict(type='agg', conf=[
-                        ('FileStorageZODB', dict(
-                            url=p(depdepbun.bundle_directory, BUNDLE_INDEXED_DB_NAME),
-                            read_only=True))
-                    ]))
-                ]))]
+        assert bnd.conf['rdf.store_conf'] == expected_two_level_store_conf(
+                testbun, depbun, depdepbun)
 
 
 def test_bundle_store_conf_with_two_levels_excludes(custom_bundle):
@@ -550,10 +490,8 @@ def test_bundle_store_conf_with_two_levels_excludes(custom_bundle):
 
     # Add some triples so the contexts aren't empty -- we can't save an empty context
     g = rdflib.ConjunctiveGraph()
-    cg_1 = g.get_context(ctxid_1)
-    cg_2 = g.get_context(ctxid_2)
-    cg_1.add((aURI('a'), aURI('b'), aURI('c')))
-    cg_2.add((aURI('d'), aURI('e'), aURI('f')))
+    g.addN([(aURI('a'), aURI('b'), aURI('c'), g.get_context(ctxid_1)),
+            (aURI('d'), aURI('e'), aURI('f'), g.get_context(ctxid_2))])
 
     # End setup
 
@@ -561,27 +499,29 @@ def test_bundle_store_conf_with_two_levels_excludes(custom_bundle):
             custom_bundle(dep_d, bundles_directory=depdepbun.bundles_directory) as depbun, \
             custom_bundle(d, bundles_directory=depbun.bundles_directory) as testbun, \
             Bundle('test', bundles_directory=testbun.bundles_directory) as bnd:
-        assert bnd.conf['rdf.store_conf'] == [
-                ('FileStorageZODB', dict(
-                    url=p(testbun.bundle_directory, BUNDLE_INDEXED_DB_NAME),
-                    read_only=True)),
-                # dep
-                ('owmeta_core_bds', dict(type='agg', conf=[
-                    ('FileStorageZODB', dict(
-                        url=p(depbun.bundle_directory, BUNDLE_INDEXED_DB_NAME),
-                        read_only=True)),
-                    ('owmeta_core_bds', dict(type='agg', conf=[
-                        ('FileStorageZODB', dict(
-                            url=p(depdepbun.bundle_directory, BUNDLE_INDEXED_DB_NAME),
-                            read_only=True))
-                    ]))
-                ], excludes=[ctxid_1])),
-                # depdep
-                ('owmeta_core_bds', dict(type='agg', conf=[
-                    ('FileStorageZODB', dict(
-                        url=p(depdepbun.bundle_directory, BUNDLE_INDEXED_DB_NAME),
-                        read_only=True))
-                ]))]
+        assert bnd.conf['rdf.store_conf'] == expected_two_level_store_conf(
+                testbun, depbun, depdepbun, dep_excludes=[ctxid_1])
+
+
+def indexed_db_conf(bundle):
+    return ('FileStorageZODB', dict(
+        url=p(bundle.bundle_directory, BUNDLE_INDEXED_DB_NAME),
+        read_only=True))
+
+
+def expected_two_level_store_conf(testbun, depbun, depdepbun, dep_excludes=None):
+    '''
+    Expected store config for "test" depending on "dep" and "dep_dep" where "dep" also
+    depends on "dep_dep". "dep_dep" only gets its own entry if "dep" has excludes
+    '''
+    depdep_conf = ('owmeta_core_bds', dict(type='agg', conf=[indexed_db_conf(depdepbun)]))
+    dep_conf_kwargs = dict(type='agg', conf=[indexed_db_conf(depbun), depdep_conf])
+    if dep_excludes:
+        dep_conf_kwargs['excludes'] = dep_excludes
+    res = [indexed_db_conf(testbun), ('owmeta_core_bds', dep_conf_kwargs)]
+    if dep_excludes:
+        res.append(depdep_conf)
+    return res
 
 
 def aURI(c):
@@ -6,7 +6,7 @@ except ImportError:
     from mock import Mock
 
 from pytest import raises
-from owmeta_core.command_util import SubCommand, IVar
+from owmeta_core.command_util import SubCommand, IVar, PlainIVar
 from owmeta_core.cli_command_wrapper import CLICommandWrapper, CLIArgMapper
 from owmeta_core.cli_common import METHOD_NAMED_ARG, METHOD_NARGS, METHOD_KWARGS
 from .TestUtilities import noexit, stdout
@@ -136,6 +136,33 @@ class CLICommandWrapperTest(unittest.TestCase):
             parser.parse_args(['sc', '--help'])
         self.assertIn('TEST_STRING', out.getvalue())
 
+    def test_plain_ivar_set(self):
+        class A(object):
+            p = PlainIVar('default')
+
+            def sc(self):
+                pass
+        a = A()
+        cm = CLICommandWrapper(a)
+        parser = cm.parser()
+        parser.parse_args(['--p', 'given', 'sc'])
+        cm.mapper.apply(a)
+        self.assertEqual(a.p, 'given')
+        self.assertEqual(A().p, 'default')
+
+    def test_plain_ivar_bool_set(self):
+        class A(object):
+            p = PlainIVar(value_type=bool)
+
+            def sc(self):
+                pass
+        a = A()
+        cm = CLICommandWrapper(a)
+        parser = cm.parser()
+        parser.parse_args(['--p', 'sc'])
+        cm.mapper.apply(a)
+        self.assertIs(a.p, True)
+
 
 class CLIArgMapperTest(unittest.TestCase):
 
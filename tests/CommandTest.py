@@ -19,7 +19,7 @@ from owmeta_core.context import (DEFAULT_CONTEXT_KEY, IMPORTS_CONTEXT_KEY,
                                  CLASS_REGISTRY_CONTEXT_KEY, Context)
 from owmeta_core.context_common import CONTEXT_IMPORTS
 from owmeta_core.bittorrent import BitTorrentDataSourceDirLoader
-from owmeta_core.command_util import IVar, PropertyIVar
+from owmeta_core.command_util import IVar, PropertyIVar, PlainIVar
 from owmeta_core.datasource import DataTranslator, DataSource
 from owmeta_core.datasource_loader import LoadFailed
 from owmeta_core.cli_command_wrapper import CLICommandWrapper
@@ -693,6 +693,29 @@ class IVarTest(unittest.TestCase):
 
         self.assertEqual(A().p, 3)
 
+    def test_plain_ivar_default(self):
+        class A(object):
+            p = PlainIVar(3)
+
+        self.assertEqual(A().p, 3)
+
+    def test_plain_ivar_shadowed_by_instance(self):
+        class A(object):
+            p = PlainIVar(3)
+
+        a = A()
+        a.p = 4
+        self.assertEqual(a.p, 4)
+        self.assertEqual(A().p, 3)
+
+    def test_plain_ivar_read_does_not_store(self):
+        class A(object):
+            p = PlainIVar([])
+
+        a = A()
+        a.p
+        self.assertNotIn('p', vars(a))
+
 
 class IVarPropertyTest(unittest.TestCase):
 
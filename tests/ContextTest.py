@@ -1,10 +1,17 @@
+from collections import namedtuple
+from functools import lru_cache
+from types import SimpleNamespace
+import unittest
+
 import rdflib
 from rdflib.term import URIRef, Variable
 from owmeta_core.data import Data
 from owmeta_core.dataobject import DataObject, InverseProperty
 from owmeta_core.mapper import Mapper
 from owmeta_core.context import Context, IMPORTS_CONTEXT_KEY
-from owmeta_core.context_store import ContextStore, ContextStoreException, RDFContextStore
+from owmeta_core.context_store import (ContextStore, ContextStoreException, RDFContextStore,
+                                      IndexedMemoryStore)
+from owmeta_core.context_common import CONTEXT_IMPORTS
 from .DataTestTemplate import _DataTest
 try:
     from unittest.mock import MagicMock, Mock, patch
@@ -12,83 +19,103 @@ except ImportError:
     from mock import MagicMock, Mock, patch
 
 
-class ContextTest(_DataTest):
-    def test_inverse_property_context(self):
-        class A(DataObject):
-            unmapped = True
+class InvA(DataObject):
+    unmapped = True
+
+    def __init__(self, **kwargs):
+        super(InvA, self).__init__(**kwargs)
+        self.a = InvA.ObjectProperty(value_type=InvB)
+
+
+class InvB(DataObject):
+    unmapped = True
+
+    def __init__(self, **kwargs):
+        super(InvB, self).__init__(**kwargs)
+        self.b = InvB.ObjectProperty(value_type=InvA)
+
+
+InverseProperty(InvB, 'b', InvA, 'a')
+
+
+class DefA(DataObject):
+    def __init__(self, **kwargs):
+        super(DefA, self).__init__(**kwargs)
+        self.a = DefA.ObjectProperty(value_type=DefB)
+
+    def defined_augment(self):
+        return self.a.has_defined_value()
 
-            def __init__(self, **kwargs):
-                super(A, self).__init__(**kwargs)
-                self.a = A.ObjectProperty(value_type=B)
+    def identifier_augment(self):
+        return self.make_identifier(self.a.onedef().identifier.n3())
 
-        class B(DataObject):
-            unmapped = True
 
-            def __init__(self, **kwargs):
-                super(B, self).__init__(**kwargs)
-                self.b = B.ObjectProperty(value_type=A)
+class DefB(DataObject):
+    def __init__(self, **kwargs):
+        super(DefB, self).__init__(**kwargs)
+        self.b = DefB.ObjectProperty(value_type=DefA)
 
-        InverseProperty(B, 'b', A, 'a')
+
+InverseProperty(DefB, 'b', DefA, 'a')
+
+
+class A(DataObject):
+    pass
+
+
+def _minimal_conf(**kwargs):
+    '''
+    A configuration holding just a graph, shared by all contexts given the configuration,
+    for tests that don't need a full `Data`
+    '''
+    conf = {'rdf.graph': rdflib.ConjunctiveGraph()}
+    conf.update(kwargs)
+    return conf
+
+
+class ContextTest(_DataTest):
+    def test_inverse_property_context(self):
         ctx1 = Context(ident='http://example.org/context_1')
         ctx2 = Context(ident='http://example.org/context_2')
-        a = ctx1(A)(ident='a')
-        b = ctx2(B)(ident='b')
+        a = ctx1(InvA)(ident='a')
+        b = ctx2(InvB)(ident='b')
         a.a(b)
-        expected = (URIRef('b'), B.schema_namespace['b'], URIRef('a'))
-        self.assertIn(expected, list(ctx1.contents_triples()))
+        expected = (URIRef('b'), InvB.schema_namespace['b'], URIRef('a'))
+        self.assertIn(expected, ctx1)
 
     def test_defined(self):
-        class A(DataObject):
-            def __init__(self, **kwargs):
-                super(A, self).__init__(**kwargs)
-                self.a = A.ObjectProperty(value_type=B)
-
-            def defined_augment(self):
-                return self.a.has_defined_value()
-
-            def identifier_augment(self):
-                return self.make_identifier(self.a.onedef().identifier.n3())
-
-        class B(DataObject):
-            def __init__(self, **kwargs):
-                super(B, self).__init__(**kwargs)
-                self.b = B.ObjectProperty(value_type=A)
-        InverseProperty(B, 'b', A, 'a')
         ctx1 = Context(ident='http://example.org/context_1')
         ctx2 = Context(ident='http://example.org/context_2')
-        a = ctx1(A)()
-        b = ctx2(B)(ident='b')
+        a = ctx1(DefA)()
+        b = ctx2(DefB)(ident='b')
         a.a(b)
         self.assertTrue(a.defined)
 
     def test_save_context_no_graph(self):
         ctx = Context()
         with patch('owmeta_core.data.ALLOW_UNCONNECTED_DATA_USERS', False):
-            with self.assertRaisesRegexp(Exception, r'graph'):
+            with self.assertRaisesRegex(Exception, r'graph'):
                 ctx.save_context()
 
     def test_imports_no_imports_graph_in_stored(self):
-        # create a Data config so all contexts use the same rdflib.Graph
-        conf = Data()
+        conf = _minimal_conf()
         ctx = Context('http://example.org/ctx1', conf=conf)
         imported_ctx = Context('http://example.org/ctx2', conf=conf)
         other_ctx = Context('http://example.org/other_ctx', conf=conf)
         ctx.add_import(imported_ctx)
         ctx.save_imports(other_ctx)
 
-        assert list(ctx.stored.imports) == []
+        assert next(iter(ctx.stored.imports), None) is None
 
     def test_imports_in_diff_context_with_imports_graph_in_stored(self):
-        # create a Data config so all contexts use the same rdflib.Graph
-        conf = Data()
-        conf[IMPORTS_CONTEXT_KEY] = 'http://example.org/imports'
+        conf = _minimal_conf(**{IMPORTS_CONTEXT_KEY: 'http://example.org/imports'})
         ctx = Context('http://example.org/ctx1', conf=conf)
         imported_ctx = Context('http://example.org/ctx2', conf=conf)
         other_ctx = Context('http://example.org/other_ctx', conf=conf)
         ctx.add_import(imported_ctx)
         ctx.save_imports(other_ctx)
 
-        assert list(ctx.stored.imports) == []
+        assert next(iter(ctx.stored.imports), None) is None
 
     def test_imports_with_imports_graph_in_stored(self):
         # create a Data config so all contexts use the same rdflib.Graph
@@ -104,9 +131,6 @@ class ContextTest(_DataTest):
         assert [c.identifier for c in ctx.stored.imports] == [imported_ctx.identifier]
 
     def test_context_store(self):
-        class A(DataObject):
-            pass
-
         mapper = Mapper()
         mapper.add_class(A)
         ctx = Context(ident='http://example.com/context_1', mapper=mapper)
@@ -115,76 +139,10 @@ class ContextTest(_DataTest):
                       tuple(x.identifier for x in ctx.mixed(A)().load()))
 
     def test_decontextualize(self):
-        class A(DataObject):
-            pass
         ctx = Context(ident='http://example.com/context_1')
         ctxda = ctx(A)(ident='anA')
         self.assertIsNone(ctxda.decontextualize().context)
 
-    def test_contextualize_diff_stored(self):
-        conf1 = Data({IMPORTS_CONTEXT_KEY: 'http://example.org/imports_1'})
-        conf2 = Data({IMPORTS_CONTEXT_KEY: 'http://example.org/imports_2'})
-
-        conf1.init()
-        conf2.init()
-
-        class A(DataObject):
-            pass
-
-        ctx1 = Context(ident='http://example.net/context_1', conf=conf1)
-        ctx2 = Context(ident='http://example.net/context_1', conf=conf2)
-
-        ctx3_1 = Context(ident='http://example.net/context_3', conf=conf1)
-        ctx3_1.add_import(ctx1)
-
-        ctx3_2 = Context(ident='http://example.net/context_3', conf=conf2)
-        ctx3_2.add_import(ctx2)
-
-        ctx1(A)(ident='http://example.com/ob1')
-        ctx2(A)(ident='http://example.com/ob2')
-
-        ctx1.save()
-        ctx2.save()
-        ctx3_1.save_imports()
-        ctx3_2.save_imports()
-
-        ctx3 = Context(ident='http://example.net/context_3')
-
-        ctx3_1_stored = ctx1(ctx3).stored
-        ctx3_2_stored = ctx2(ctx3).stored
-        a1 = list(ctx3_1_stored(A)().load())[0]
-        a2 = list(ctx3_2_stored(A)().load())[0]
-        assert str(a1.identifier) == 'http://example.com/ob1'
-        assert str(a2.identifier) == 'http://example.com/ob2'
-
-    def test_contextualize_diff_own_stored(self):
-        conf1 = Data({IMPORTS_CONTEXT_KEY: 'http://example.org/imports_1'})
-        conf2 = Data({IMPORTS_CONTEXT_KEY: 'http://example.org/imports_2'})
-
-        conf1.init()
-        conf2.init()
-
-        class A(DataObject):
-            pass
-
-        ctx1 = Context(ident='http://example.net/context_1', conf=conf1)
-        ctx2 = Context(ident='http://example.net/context_1', conf=conf2)
-
-        ctx1(A)(ident='http://example.com/ob1')
-        ctx2(A)(ident='http://example.com/ob2')
-
-        ctx1.save()
-        ctx2.save()
-
-        ctx3 = Context(ident='http://example.net/context_1')
-
-        ctx3_1_stored = ctx1(ctx3).stored
-        ctx3_2_stored = ctx2(ctx3).stored
-        a1 = list(ctx3_1_stored(A)().load())[0]
-        a2 = list(ctx3_2_stored(A)().load())[0]
-        assert str(a1.identifier) == 'http://example.com/ob1'
-        assert str(a2.identifier) == 'http://example.com/ob2'
-
     def test_init_imports(self):
         ctx = Context(ident='http://example.com/context_1')
         self.assertEqual(len(list(ctx.imports)), 0)
@@ -216,6 +174,20 @@ class ContextTest(_DataTest):
         final_ctx.save_imports(ctx0)
         self.assertEqual(len(ctx0), 4)
 
+    def test_rdf_graph_reused(self):
+        ctx = Context(ident='http://example.com/context_1')
+        self.assertIs(ctx.rdf_graph(), ctx.rdf_graph())
+
+    def test_rdf_graph_updated_after_add_import(self):
+        ident_uri = 'http://example.com/context_1'
+        ident_uri2 = 'http://example.com/context_2'
+        ctx = Context(ident=ident_uri)
+        ctx2 = Context(ident=ident_uri2)
+        ctx2.add_statement(create_mock_statement(ident_uri2, 1))
+        self.assertEqual(len(ctx.rdf_graph()), 0)
+        ctx.add_import(ctx2)
+        self.assertEqual(len(ctx.rdf_graph()), 1)
+
     def test_init_len(self):
         ctx = Context(ident='http://example.com/context_1')
         self.assertEqual(len(ctx), 0)
@@ -223,16 +195,14 @@ class ContextTest(_DataTest):
     def test_len(self):
         ident_uri = 'http://example.com/context_1'
         ctx = Context(ident=ident_uri)
-        for i in range(5):
-            ctx.add_statement(create_mock_statement(ident_uri, i))
+        ctx.add_statements(create_mock_statement(ident_uri, i) for i in range(5))
         self.assertEqual(len(ctx), 5)
 
     def test_add_remove_statement(self):
         ident_uri = 'http://example.com/context_1'
         ctx = Context(ident=ident_uri)
         stmt_to_remove = create_mock_statement(ident_uri, 42)
-        for i in range(5):
-            ctx.add_statement(create_mock_statement(ident_uri, i))
+        ctx.add_statements(create_mock_statement(ident_uri, i) for i in range(5))
         ctx.add_statement(stmt_to_remove)
         ctx.remove_statement(stmt_to_remove)
         self.assertEqual(len(ctx), 5)
@@ -243,22 +213,35 @@ class ContextTest(_DataTest):
         with self.assertRaises(ValueError):
             ctx.add_statement(stmt1)
 
+    def test_add_statements_with_different_context(self):
+        ident_uri = 'http://example.com/context_1'
+        ctx = Context(ident=ident_uri)
+        stmts = [create_mock_statement(ident_uri, 1),
+                 create_mock_statement('http://example.com/context_2', 2)]
+        with self.assertRaises(ValueError):
+            ctx.add_statements(stmts)
+        self.assertEqual(len(ctx), 0)
+
     def test_contents_triples(self):
-        res_wanted = []
         ident_uri = 'http://example.com/context_1'
         ctx = Context(ident=ident_uri)
-        for i in range(5):
-            stmt = create_mock_statement(ident_uri, i)
-            ctx.add_statement(stmt)
-            res_wanted.append(stmt.to_triple())
-        for triples in ctx.contents_triples():
-            self.assertTrue(triples in res_wanted)
+        stmts = [create_mock_statement(ident_uri, i) for i in range(5)]
+        ctx.add_statements(stmts)
+        res_wanted = {stmt.to_triple() for stmt in stmts}
+        for triple in ctx.contents_triples():
+            self.assertIn(triple, res_wanted)
+
+    def test_contains(self):
+        ident_uri = 'http://example.com/context_1'
+        ctx = Context(ident=ident_uri)
+        ctx.add_statement(create_mock_statement(ident_uri, 1))
+        self.assertIn((True, 1, -1), ctx)
+        self.assertNotIn((True, 2, -2), ctx)
 
     def test_clear(self):
         ident_uri = 'http://example.com/context_1'
         ctx = Context(ident=ident_uri)
-        for i in range(5):
-            ctx.add_statement(create_mock_statement(ident_uri, i))
+        ctx.add_statements(create_mock_statement(ident_uri, i) for i in range(5))
         ctx.clear()
         self.assertEqual(len(ctx), 0)
 
@@ -266,8 +249,7 @@ class ContextTest(_DataTest):
         graph = set()
         ident_uri = 'http://example.com/context_1'
         ctx = Context(ident=ident_uri)
-        for i in range(5):
-            ctx.add_statement(create_mock_statement(ident_uri, i))
+        ctx.add_statements(create_mock_statement(ident_uri, i) for i in range(5))
         ctx.save_context(graph)
         self.assertEqual(len(graph), 5)
 
@@ -323,9 +305,7 @@ class ContextTest(_DataTest):
         graph = set()
         ident_uri = 'http://example.com/context_1'
         ctx = Context(ident=ident_uri)
-        statement = MagicMock()
-        statement.context.identifier = rdflib.term.URIRef(ident_uri)
-        statement.to_triple.return_value = (Variable('var'), 1, 2)
+        statement = _MockStatement(_context_stub(ident_uri), (Variable('var'), 1, 2))
         ctx.add_statement(statement)
         ctx.save_context(graph)
         self.assertEqual(ctx.triples_saved, 0)
@@ -358,20 +338,97 @@ class ContextTest(_DataTest):
         self.assertEqual(ctx.context, 42)
 
 
+class ContextualizeStoredTest(_DataTest):
+    '''
+    Tests of contexts stored in two separate configurations. The configurations are
+    opened once for the class and emptied between tests.
+    '''
+
+    @classmethod
+    def setUpClass(cls):
+        cls.conf1 = Data({IMPORTS_CONTEXT_KEY: 'http://example.org/imports_1'})
+        cls.conf2 = Data({IMPORTS_CONTEXT_KEY: 'http://example.org/imports_2'})
+        cls.conf1.init()
+        cls.conf2.init()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.conf1.destroy()
+        cls.conf2.destroy()
+
+    def setUp(self):
+        super(ContextualizeStoredTest, self).setUp()
+        self.conf1['rdf.graph'].remove((None, None, None))
+        self.conf2['rdf.graph'].remove((None, None, None))
+
+    def test_contextualize_diff_stored(self):
+        ctx1 = Context(ident='http://example.net/context_1', conf=self.conf1)
+        ctx2 = Context(ident='http://example.net/context_1', conf=self.conf2)
+
+        ctx3_1 = Context(ident='http://example.net/context_3', conf=self.conf1)
+        ctx3_1.add_import(ctx1)
+
+        ctx3_2 = Context(ident='http://example.net/context_3', conf=self.conf2)
+        ctx3_2.add_import(ctx2)
+
+        ctx1(A)(ident='http://example.com/ob1')
+        ctx2(A)(ident='http://example.com/ob2')
+
+        # Each configuration has its own graph, so commit each once after all its saves
+        ctx1.save(autocommit=False)
+        ctx3_1.save_imports(autocommit=False)
+        ctx2.save(autocommit=False)
+        ctx3_2.save_imports(autocommit=False)
+        self.conf1['rdf.graph'].commit()
+        self.conf2['rdf.graph'].commit()
+
+        ctx3 = Context(ident='http://example.net/context_3')
+
+        ctx3_1_stored = ctx1(ctx3).stored
+        ctx3_2_stored = ctx2(ctx3).stored
+        a1 = list(ctx3_1_stored(A)().load())[0]
+        a2 = list(ctx3_2_stored(A)().load())[0]
+        assert str(a1.identifier) == 'http://example.com/ob1'
+        assert str(a2.identifier) == 'http://example.com/ob2'
+
+    def test_contextualize_diff_own_stored(self):
+        ctx1 = Context(ident='http://example.net/context_1', conf=self.conf1)
+        ctx2 = Context(ident='http://example.net/context_1', conf=self.conf2)
+
+        ctx1(A)(ident='http://example.com/ob1')
+        ctx2(A)(ident='http://example.com/ob2')
+
+        ctx1.save()
+        ctx2.save()
+
+        ctx3 = Context(ident='http://example.net/context_1')
+
+        ctx3_1_stored = ctx1(ctx3).stored
+        ctx3_2_stored = ctx2(ctx3).stored
+        a1 = list(ctx3_1_stored(A)().load())[0]
+        a2 = list(ctx3_2_stored(A)().load())[0]
+        assert str(a1.identifier) == 'http://example.com/ob1'
+        assert str(a2.identifier) == 'http://example.com/ob2'
+
+
+def _fake_ctx(contents=(), imports=(), identifier=None, **kwargs):
+    '''
+    A stand-in for a `Context` with just the attributes `ContextStore` reads
+    '''
+    return SimpleNamespace(contents_triples=lambda: contents, imports=list(imports),
+                           identifier=identifier, **kwargs)
+
+
 class ContextStoreTest(_DataTest):
 
     def test_query(self):
         rdf_type = 'http://example.org/A'
         ctxid = URIRef('http://example.com/context_1')
-        ctx = Mock()
         graph = MagicMock()
         graph.store.triples.return_value = [((URIRef('anA0'), rdflib.RDF.type, rdf_type), (ctxid,))]
         graph.store.triples_choices.return_value = []
-        ctx.rdf = graph
-
-        ctx.contents_triples.return_value = [(URIRef('anA'), rdflib.RDF.type, rdf_type)]
-        ctx.identifier = ctxid
-        ctx.imports = []
+        ctx = _fake_ctx(rdf=graph, identifier=ctxid,
+                        contents=[(URIRef('anA'), rdflib.RDF.type, rdf_type)])
         store = ContextStore(ctx, include_stored=True)
         self.assertEqual(set([URIRef('anA'), URIRef('anA0')]),
                          set(x[0][0] for x in store.triples((None, rdflib.RDF.type, rdf_type))))
@@ -379,36 +436,24 @@ class ContextStoreTest(_DataTest):
     def test_contexts_staged_ignores_stored(self):
         ctxid0 = URIRef('http://example.com/context_0')
         ctxid1 = URIRef('http://example.com/context_1')
-        ctx = Mock()
         graph = Mock()
         graph.store.triples_choices.side_effect = [[((None, None, ctxid0), ())], []]
-        ctx.conf = {'rdf.graph': graph}
-        ctx.contents_triples.return_value = ()
-        ctx.identifier = ctxid1
-        ctx.imports = []
+        ctx = _fake_ctx(conf={'rdf.graph': graph}, identifier=ctxid1)
         store = ContextStore(ctx)
         self.assertNotIn(ctxid0, set(store.contexts()))
 
     def test_contexts_combined(self):
         ctxid0 = URIRef('http://example.com/context_0')
         ctxid1 = URIRef('http://example.com/context_1')
-        ctx = Mock()
         graph = MagicMock()
         graph.store.triples_choices.side_effect = [[((None, None, ctxid0), ())], []]
-        ctx.rdf = graph
-        ctx.contents_triples.return_value = ()
-        ctx.identifier = ctxid1
-        ctx.imports = []
+        ctx = _fake_ctx(rdf=graph, identifier=ctxid1)
         store = ContextStore(ctx, include_stored=True)
         self.assertEqual(set([ctxid0, ctxid1]),
                          set(store.contexts()))
 
     def test_len_fail(self):
-        ctx = Mock()
-        graph = Mock()
-        ctx.rdf = graph
-        ctx.contents_triples.return_value = ()
-        ctx.imports = []
+        ctx = _fake_ctx(rdf=Mock())
         store = ContextStore(ctx, include_stored=True)
         with self.assertRaises(NotImplementedError):
             len(store)
@@ -426,11 +471,7 @@ class ContextStoreTest(_DataTest):
             cut.triples(None)
 
     def test_no_stored_length(self):
-        ctx = Mock()
-        graph = Mock()
-        ctx.rdf = graph
-        ctx.contents_triples.return_value = ()
-        ctx.imports = []
+        ctx = _fake_ctx(rdf=Mock())
         cut = ContextStore(ctx, include_stored=False)
         self.assertEqual(0, len(cut))
 
@@ -501,9 +542,243 @@ class RDFContextStoreTest(_DataTest):
         cut = RDFContextStore(context=ctx)
         self.assertEqual(pre, cut.prefix('namespace'))
 
+    def test_triples_single_context(self):
+        ctxid = URIRef('http://example.org/ctx')
+        g = rdflib.ConjunctiveGraph()
+        trip = (URIRef('http://example.org/s'),
+                URIRef('http://example.org/p'),
+                URIRef('http://example.org/o'))
+        g.get_context(ctxid).add(trip)
+        g.get_context(URIRef('http://example.org/other_ctx')).add(trip)
+        ctx = Mock()
+        ctx.identifier = ctxid
+        ctx.rdf = g
+        cut = RDFContextStore(context=ctx, include_imports=False)
+        self.assertEqual([(trip, frozenset([ctxid]))], list(cut.triples((None, None, None))))
+
+    def _two_import_store(self):
+        ctxid = URIRef('http://example.org/ctx')
+        self.ctxid1 = URIRef('http://example.org/ctx1')
+        self.ctxid2 = URIRef('http://example.org/ctx2')
+        self.unimported = URIRef('http://example.org/unimported')
+        self.trip = (URIRef('http://example.org/s'),
+                     URIRef('http://example.org/p'),
+                     URIRef('http://example.org/o'))
+        self.g = rdflib.ConjunctiveGraph()
+        imports_graph = self.g.get_context(URIRef('http://example.org/imports'))
+        imports_graph.add((ctxid, CONTEXT_IMPORTS, self.ctxid1))
+        imports_graph.add((ctxid, CONTEXT_IMPORTS, self.ctxid2))
+        for c in (self.ctxid1, self.ctxid2, self.unimported):
+            self.g.get_context(c).add(self.trip)
+        return RDFContextStore(context=SimpleNamespace(identifier=ctxid, rdf=self.g),
+                               imports_graph=imports_graph)
+
+    def test_triples_in_context_reports_all_imported_contexts(self):
+        cut = self._two_import_store()
+        self.assertEqual([(self.trip, frozenset([self.ctxid1, self.ctxid2]))],
+                         list(cut.triples((None, None, None), self.ctxid1)))
+
+    def test_triples_choices_in_context_reports_all_imported_contexts(self):
+        cut = self._two_import_store()
+        self.assertEqual([(self.trip, frozenset([self.ctxid1, self.ctxid2]))],
+                         list(cut.triples_choices((None, None, [self.trip[2]]),
+                                                  self.ctxid1)))
+
+    def test_remove_in_context_removes_from_all_imported_contexts(self):
+        cut = self._two_import_store()
+        cut.remove(self.trip, self.ctxid1)
+        self.assertNotIn(self.trip, self.g.get_context(self.ctxid1))
+        self.assertNotIn(self.trip, self.g.get_context(self.ctxid2))
+        self.assertIn(self.trip, self.g.get_context(self.unimported))
+
+    def _single_import_store(self):
+        ctxid = URIRef('http://example.org/ctx')
+        self.other = URIRef('http://example.org/other')
+        self.trip = (URIRef('http://example.org/s'),
+                     URIRef('http://example.org/p'),
+                     URIRef('http://example.org/o'))
+        self.g = rdflib.ConjunctiveGraph()
+        for c in (ctxid, self.other):
+            self.g.get_context(c).add(self.trip)
+        self.ctxid = ctxid
+        return RDFContextStore(context=SimpleNamespace(identifier=ctxid, rdf=self.g),
+                               include_imports=False)
+
+    def test_triples_single_import_reports_only_that_context(self):
+        cut = self._single_import_store()
+        self.assertEqual([(self.trip, frozenset([self.ctxid]))],
+                         list(cut.triples((None, None, None))))
+
+    def test_triples_choices_single_import_reports_only_that_context(self):
+        cut = self._single_import_store()
+        self.assertEqual([(self.trip, frozenset([self.ctxid]))],
+                         list(cut.triples_choices((None, None, [self.trip[2]]))))
+
+    def test_remove_single_import_removes_only_from_that_context(self):
+        cut = self._single_import_store()
+        cut.remove(self.trip)
+        self.assertNotIn(self.trip, self.g.get_context(self.ctxid))
+        self.assertIn(self.trip, self.g.get_context(self.other))
+
+    def test_transitive_imports_updated_after_import_added(self):
+        ctxid = URIRef('http://example.org/ctx')
+        ctxid1 = URIRef('http://example.org/ctx1')
+        ctxid2 = URIRef('http://example.org/ctx2')
+        g = rdflib.ConjunctiveGraph()
+        imports_graph = g.get_context(URIRef('http://example.org/imports'))
+        imports_graph.add((ctxid, CONTEXT_IMPORTS, ctxid1))
+        trip1 = (URIRef('http://example.org/s'),
+                 URIRef('http://example.org/p'),
+                 URIRef('http://example.org/o1'))
+        trip2 = (URIRef('http://example.org/s'),
+                 URIRef('http://example.org/p'),
+                 URIRef('http://example.org/o2'))
+        g.get_context(ctxid1).add(trip1)
+        g.get_context(ctxid2).add(trip2)
+        ctx = Mock()
+        ctx.identifier = ctxid
+        ctx.rdf = g
+        cut = RDFContextStore(context=ctx, imports_graph=imports_graph)
+        self.assertEqual({trip1}, set(t for t, _ in cut.triples((trip1[0], None, None))))
+
+        imports_graph.add((ctxid, CONTEXT_IMPORTS, ctxid2))
+        cut = RDFContextStore(context=ctx, imports_graph=imports_graph)
+        self.assertEqual({trip1, trip2}, set(t for t, _ in cut.triples((trip1[0], None, None))))
+
+    def test_transitive_imports_updated_after_import_replaced(self):
+        ctxid = URIRef('http://example.org/ctx')
+        ctxid1 = URIRef('http://example.org/ctx1')
+        ctxid2 = URIRef('http://example.org/ctx2')
+        g = rdflib.ConjunctiveGraph()
+        imports_graph = g.get_context(URIRef('http://example.org/imports'))
+        imports_graph.add((ctxid, CONTEXT_IMPORTS, ctxid1))
+        trip1 = (URIRef('http://example.org/s'),
+                 URIRef('http://example.org/p'),
+                 URIRef('http://example.org/o1'))
+        trip2 = (URIRef('http://example.org/s'),
+                 URIRef('http://example.org/p'),
+                 URIRef('http://example.org/o2'))
+        g.get_context(ctxid1).add(trip1)
+        g.get_context(ctxid2).add(trip2)
+        ctx = Mock()
+        ctx.identifier = ctxid
+        ctx.rdf = g
+        cut = RDFContextStore(context=ctx, imports_graph=imports_graph)
+        self.assertEqual({trip1}, set(t for t, _ in cut.triples((trip1[0], None, None))))
+
+        # Same number of triples in the imports graph, different import
+        imports_graph.remove((ctxid, CONTEXT_IMPORTS, ctxid1))
+        imports_graph.add((ctxid, CONTEXT_IMPORTS, ctxid2))
+        cut = RDFContextStore(context=ctx, imports_graph=imports_graph)
+        self.assertEqual({trip2}, set(t for t, _ in cut.triples((trip1[0], None, None))))
+
+    def test_store_len_not_needed_for_bound_pattern(self):
+        ctx = Mock()
+        ctx.identifier = None
+        g = MagicMock(name='graph')
+        ctx.rdf = g
+        g.store.contexts.return_value = [URIRef('http://example.org/ctx1'),
+                                         URIRef('http://example.org/ctx2')]
+        g.store.triples.return_value = []
+        list(RDFContextStore(context=ctx).triples((URIRef('http://example.org/s'), None, None)))
+        g.store.__len__.assert_not_called()
+
+    def test_store_len_counted_once_per_store(self):
+        ctx = Mock()
+        ctx.identifier = None
+        g = MagicMock(name='graph')
+        ctx.rdf = g
+        g.store.contexts.return_value = [URIRef('http://example.org/ctx1'),
+                                         URIRef('http://example.org/ctx2')]
+        g.store.__len__.return_value = 2
+        g.store.triples.return_value = []
+        cut = RDFContextStore(context=ctx)
+        list(cut.triples((None, None, None)))
+        list(cut.triples((None, None, None)))
+        self.assertEqual(3, g.store.__len__.call_count)
+
+    def test_store_len_not_shared_between_stores(self):
+        ctx = Mock()
+        ctx.identifier = None
+        g = MagicMock(name='graph')
+        ctx.rdf = g
+        g.store.contexts.return_value = [URIRef('http://example.org/ctx1'),
+                                         URIRef('http://example.org/ctx2')]
+        g.store.__len__.return_value = 2
+        g.store.triples.return_value = []
+        list(RDFContextStore(context=ctx).triples((None, None, None)))
+        list(RDFContextStore(context=ctx).triples((None, None, None)))
+        self.assertEqual(6, g.store.__len__.call_count)
+
+
+class IndexedMemoryStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.ctx0 = URIRef('http://example.org/ctx0')
+        self.ctx1 = URIRef('http://example.org/ctx1')
+        self.s = URIRef('http://example.org/s')
+        self.p = URIRef('http://example.org/p')
+        self.o0 = URIRef('http://example.org/o0')
+        self.o1 = URIRef('http://example.org/o1')
+        self.cut = IndexedMemoryStore()
+        self.cut.addN([(self.s, self.p, self.o0, self.ctx0),
+                       (self.s, self.p, self.o1, self.ctx0),
+                       (self.s, self.p, self.o1, self.ctx1)])
+
+    def query(self, pattern, context=None):
+        return {t: set(ctxs) for t, ctxs in self.cut.triples(pattern, context)}
+
+    def test_all(self):
+        self.assertEqual({(self.s, self.p, self.o0): {self.ctx0},
+                          (self.s, self.p, self.o1): {self.ctx0, self.ctx1}},
+                         self.query((None, None, None)))
+
+    def test_subject_object(self):
+        self.assertEqual({(self.s, self.p, self.o0): {self.ctx0}},
+                         self.query((self.s, None, self.o0)))
+
+    def test_predicate_object(self):
+        self.assertEqual({(self.s, self.p, self.o1): {self.ctx0, self.ctx1}},
+                         self.query((None, self.p, self.o1)))
+
+    def test_object(self):
+        self.assertEqual({(self.s, self.p, self.o0): {self.ctx0}},
+                         self.query((None, None, self.o0)))
+
+    def test_fully_bound(self):
+        self.assertEqual({(self.s, self.p, self.o0): {self.ctx0}},
+                         self.query((self.s, self.p, self.o0)))
+
+    def test_no_match(self):
+        self.assertEqual({}, self.query((self.o0, None, None)))
+
+    def test_context(self):
+        self.assertEqual({(self.s, self.p, self.o1): {self.ctx0, self.ctx1}},
+                         self.query((None, None, None), self.ctx1))
+
+    def test_len(self):
+        self.assertEqual(2, len(self.cut))
+        self.assertEqual(1, self.cut.__len__(context=self.ctx1))
+
+    def test_contexts(self):
+        self.assertEqual({self.ctx0, self.ctx1}, set(self.cut.contexts()))
+        self.assertEqual({self.ctx0}, set(self.cut.contexts((self.s, self.p, self.o0))))
+
+
+_MockContext = namedtuple('_MockContext', ('identifier',))
+
+
+class _MockStatement(namedtuple('_MockStatement', ('context', 'triple'))):
+    __slots__ = ()
+
+    def to_triple(self):
+        return self.triple
+
+
+@lru_cache(maxsize=None)
+def _context_stub(ident_uri):
+    return _MockContext(URIRef(ident_uri))
+
 
 def create_mock_statement(ident_uri, stmt_id):
-    statement = MagicMock()
-    statement.context.identifier = rdflib.term.URIRef(ident_uri)
-    statement.to_triple.return_value = (True, stmt_id, -stmt_id)
-    return statement
+    return _MockStatement(_context_stub(ident_uri), (True, stmt_id, -stmt_id))
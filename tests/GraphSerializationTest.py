@@ -0,0 +1,79 @@
+import hashlib
+from io import BytesIO
+from os.path import join as p
+from unittest.mock import patch
+
+from rdflib import plugin
+from rdflib.graph import Graph
+from rdflib.serializer import Serializer
+from rdflib.term import URIRef, Literal, BNode
+
+from owmeta_core.graph_serialization import write_canonical, write_canonical_to_file
+
+
+def ex(s):
+    return URIRef('http://example.org/' + s)
+
+
+def rdflib_nt(graph):
+    out = BytesIO()
+    plugin.get('nt', Serializer)(sorted(graph)).serialize(out)
+    return out.getvalue()
+
+
+def canonical(graph):
+    out = BytesIO()
+    write_canonical(graph, out)
+    return out.getvalue()
+
+
+def test_uriref_triples_same_as_rdflib():
+    g = Graph()
+    g.add((ex('a'), ex('b'), ex('c')))
+    g.add((ex('d'), ex('e'), ex('f')))
+    assert rdflib_nt(g) == canonical(g)
+
+
+def test_non_ascii_uriref_same_as_rdflib():
+    g = Graph()
+    g.add((ex('a'), ex('b'), ex('ü')))
+    assert rdflib_nt(g) == canonical(g)
+
+
+def test_mixed_terms_same_as_rdflib():
+    g = Graph()
+    g.add((ex('a'), ex('b'), Literal('x\ny"z', lang='en')))
+    g.add((BNode('x'), ex('b'), Literal(3)))
+    assert rdflib_nt(g) == canonical(g)
+
+
+def test_batched_writes_same_as_rdflib():
+    g = Graph()
+    for i in range(10):
+        g.add((ex('a'), ex('b'), ex(str(i))))
+    with patch('owmeta_core.graph_serialization._WRITE_BATCH_SIZE', 3):
+        assert rdflib_nt(g) == canonical(g)
+
+
+def test_interleaved_terms_batched_same_as_rdflib():
+    g = Graph()
+    for i in range(10):
+        g.add((ex('a'), ex('b'), ex(str(i))))
+        g.add((ex('a'), ex('b'), Literal(i)))
+        g.add((ex('a%d' % i), ex('b'), Literal('x%d' % i)))
+    with patch('owmeta_core.graph_serialization._WRITE_BATCH_SIZE', 3):
+        assert rdflib_nt(g) == canonical(g)
+
+
+def test_empty_graph_same_as_rdflib():
+    assert rdflib_nt(Graph()) == canonical(Graph())
+
+
+def test_write_to_file_hash(tempdir):
+    g = Graph()
+    g.add((ex('a'), ex('b'), ex('c')))
+    hsh = hashlib.sha224()
+    fname = p(tempdir, 'out.nt')
+    write_canonical_to_file(g, fname, hsh)
+    with open(fname, 'rb') as f:
+        assert hashlib.sha224(f.read()).digest() == hsh.digest()
@@ -7,7 +7,7 @@ import pytest
 
 from owmeta_core.bundle import URLConfig
 from owmeta_core.bundle.loaders import LoadFailed
-from owmeta_core.bundle.loaders.http import HTTPBundleLoader
+from owmeta_core.bundle.loaders.http import HTTPBundleLoader, _retrieve_cached_provider
 
 
 def test_can_load_from_http():
@@ -22,6 +22,19 @@ def test_cannot_load_from_ftp():
     assert not HTTPBundleLoader.can_load_from(URLConfig('ftp://'))
 
 
+def test_cached_provider_cleared():
+    path = 'owmeta_core.bundle.loaders.http:HTTPBundleLoader'
+    _retrieve_cached_provider.cache_clear()
+    try:
+        assert _retrieve_cached_provider(path) is HTTPBundleLoader
+        with patch('owmeta_core.bundle.loaders.http.HTTPBundleLoader') as patched:
+            assert _retrieve_cached_provider(path) is HTTPBundleLoader
+            _retrieve_cached_provider.cache_clear()
+            assert _retrieve_cached_provider(path) is patched
+    finally:
+        _retrieve_cached_provider.cache_clear()
+
+
 def test_cannot_load_from_None():
     assert not HTTPBundleLoader.can_load_from(None)
 
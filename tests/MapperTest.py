@@ -0,0 +1,159 @@
+import unittest
+
+from owmeta_core.dataobject import DataObject
+from owmeta_core.mapper import Mapper, _sort_classes
+from owmeta_core.utils import FCN
+
+
+class A(object):
+    pass
+
+
+class B(A):
+    pass
+
+
+class C(B):
+    pass
+
+
+class D(object):
+    pass
+
+
+class E(DataObject):
+    class_context = 'http://example.org/test_context'
+
+
+class F(DataObject):
+    class_context = 'http://example.org/test_context'
+
+
+class G(DataObject):
+    class_context = 'http://example.org/test_context'
+
+
+class H(DataObject):
+    class_context = 'http://example.org/test_context'
+
+
+class SortClassesTest(unittest.TestCase):
+
+    def test_superclasses_first(self):
+        self.assertEqual([A, B, C], _sort_classes([C, A, B]))
+
+    def test_unrelated_by_name(self):
+        self.assertEqual([A, D], _sort_classes([D, A]))
+
+    def test_shallower_before_unrelated_by_name(self):
+        class Z(object):
+            pass
+
+        class Zsub(Z):
+            pass
+        self.assertEqual([A, Z, Zsub], _sort_classes([Zsub, A, Z]))
+
+    def test_superclasses_before_subclasses(self):
+        # Names chosen so that sorting by name alone would put sub-classes first
+        class Zb(object):
+            pass
+
+        class Mb(Zb):
+            pass
+
+        class Nb(Zb):
+            pass
+
+        class Ab(Mb, Nb):
+            pass
+        classes = [A, Ab, Mb, Nb, Zb, D]
+        res = _sort_classes(classes)
+        for i, x in enumerate(res):
+            for y in res[i + 1:]:
+                self.assertFalse(issubclass(x, y) and y is not x)
+
+
+class HandleMappedClassesTest(unittest.TestCase):
+
+    def test_superclasses_added_first(self):
+        added = []
+
+        class Recording(object):
+            rdf_type = None
+
+            @classmethod
+            def on_mapper_add_class(cls, mapper):
+                added.append(cls)
+                cls.rdf_type = cls.__name__
+
+        class Sub(Recording):
+            pass
+
+        class SubSub(Sub):
+            pass
+        cut = Mapper()
+        self.assertEqual([Recording, Sub, SubSub],
+                         cut.handle_mapped_classes([SubSub, Sub, Recording]))
+        self.assertEqual([Recording, Sub, SubSub], added)
+
+    def test_skips_non_classes(self):
+        cut = Mapper()
+        self.assertEqual([E], cut.handle_mapped_classes(['E', E]))
+
+
+class LookupClassTest(unittest.TestCase):
+
+    def test_lookup_after_add_to_imported(self):
+        imported = Mapper()
+        cut = Mapper(imported=(imported,))
+        self.assertIsNone(cut._lookup_class(FCN(E)))
+        imported.add_class(E)
+        self.assertIs(E, cut._lookup_class(FCN(E)))
+
+    def test_lookup_after_imported_mappers_change(self):
+        imported = Mapper()
+        imported.add_class(E)
+        cut = Mapper()
+        self.assertIsNone(cut._lookup_class(FCN(E)))
+        cut.imported_mappers = (imported,)
+        self.assertIs(E, cut._lookup_class(FCN(E)))
+
+    def test_lookup_after_registry_changed_directly(self):
+        imported = Mapper()
+        cut = Mapper(imported=(imported,))
+        self.assertIsNone(cut._lookup_class(FCN(E)))
+        imported._mapped_classes[FCN(E)] = E
+        self.assertIs(E, cut._lookup_class(FCN(E)))
+
+    def test_lookup_shared_import(self):
+        common = Mapper()
+        common.add_class(E)
+        cut = Mapper(imported=(Mapper(imported=(common,)), Mapper(imported=(common,))))
+        self.assertIs(E, cut._lookup_class(FCN(E)))
+
+
+class MappedClassesTest(unittest.TestCase):
+
+    def test_includes_imported(self):
+        imported = Mapper()
+        imported.add_class(E)
+        cut = Mapper(imported=(imported,))
+        self.assertIn(E, list(cut.mapped_classes()))
+
+    def test_shared_import_once(self):
+        common = Mapper()
+        common.add_class(E)
+        cut = Mapper(imported=(Mapper(imported=(common,)), Mapper(imported=(common,))))
+        self.assertEqual(1, sum(1 for c in cut.mapped_classes() if c is E))
+
+    def test_imported_mappers_in_import_order(self):
+        first_import = Mapper()
+        first_import.add_class(E)
+        first = Mapper(imported=(first_import,))
+        first.add_class(F)
+        second = Mapper()
+        second.add_class(G)
+        cut = Mapper(imported=(first, second))
+        cut.add_class(H)
+        self.assertEqual([E, F, G, H],
+                         [c for c in cut.mapped_classes() if c in (E, F, G, H)])
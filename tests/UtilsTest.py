@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 import unittest
-from owmeta_core.utils import ellipsize
+from unittest.mock import patch
+from owmeta_core.utils import ellipsize, retrieve_provider, FCN, _cached_fcn
 
 
 class EllipsizeTest(unittest.TestCase):
@@ -28,3 +29,31 @@ class EllipsizeTest(unittest.TestCase):
     def test_truncate(self):
         t = 'some random string'
         self.assertEqual(ellipsize(t, 0), '')
+
+
+class RetrieveProviderTest(unittest.TestCase):
+
+    def test_retrieve(self):
+        self.assertIs(retrieve_provider('owmeta_core.utils:ellipsize'), ellipsize)
+
+    def test_bad_format(self):
+        with self.assertRaises(ValueError):
+            retrieve_provider('owmeta_core.utils')
+
+    def test_missing_attribute(self):
+        with self.assertRaises(AttributeError):
+            retrieve_provider('owmeta_core.utils:not_a_provider')
+
+    def test_reflects_patched_attribute(self):
+        retrieve_provider('owmeta_core.utils:ellipsize')
+        with patch('owmeta_core.utils.ellipsize') as patched:
+            self.assertIs(retrieve_provider('owmeta_core.utils:ellipsize'), patched)
+
+
+class CachedFCNTest(unittest.TestCase):
+
+    def test_matches_fcn(self):
+        self.assertEqual(FCN(EllipsizeTest), _cached_fcn(EllipsizeTest))
+
+    def test_repeat_returns_same(self):
+        self.assertIs(_cached_fcn(EllipsizeTest), _cached_fcn(EllipsizeTest))
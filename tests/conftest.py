@@ -4,6 +4,7 @@ import json
 import logging
 import os
 from os.path import join as p
+import shutil
 import tempfile
 
 from owmeta_core.bundle import Descriptor, Installer
@@ -20,12 +21,27 @@ os.environ['HTTPS_PYTEST_FIXTURES_CERT'] = p('tests', 'cert.pem')
 os.environ['HTTPS_PYTEST_FIXTURES_KEY'] = p('tests', 'key.pem')
 
 
-@fixture
-def tempdir():
-    with tempfile.TemporaryDirectory(prefix=__name__ + '.') as td:
+@fixture(scope='session')
+def tmp_root():
+    '''
+    Session-wide parent directory for per-test temporary directories.
+
+    Placed on tmpfs when ``/dev/shm`` is available to avoid disk syncs for the many
+    short-lived directories tests create
+    '''
+    shm = '/dev/shm'
+    parent = shm if os.path.isdir(shm) and os.access(shm, os.W_OK) else None
+    with tempfile.TemporaryDirectory(prefix=__name__ + '.', dir=parent) as td:
         yield td
 
 
+@fixture
+def tempdir(tmp_root):
+    td = tempfile.mkdtemp(prefix=__name__ + '.', dir=tmp_root)
+    yield td
+    shutil.rmtree(td)
+
+
 @fixture
 def http_bundle_server(http_server):
     with open(p('tests', 'test_data', 'example_bundle.tar.xz'), 'rb') as f:
@@ -80,7 +96,7 @@ def custom_bundle_archive():
     yield bundle_archive_helper
 
 
-@fixture
+@fixture(scope='session')
 def custom_bundle():
     yield bundle_helper
 